@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+'''
+This script measures how long the wgms_scripts module takes to start for different kinds of
+commands. Each case runs in a fresh python interpreter, so it includes the full import time.
+Run it from the top of the repository.
+'''
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Code run for each case. Each one uses a function from a different submodule.
+CASES = [
+    ('import only', "import scripts.wgms_scripts"),
+    ('zipshp (fileio)', "import scripts.wgms_scripts as ws; ws.zipshp"),
+    ('print_10_largest_glims (reporting)', "import scripts.wgms_scripts as ws; ws.print_10_largest_glims"),
+    ('pip (geometry)', "import scripts.wgms_scripts as ws; ws.pip"),
+    ('reproject_raster (raster)', "import scripts.wgms_scripts as ws; ws.reproject_raster"),
+    ('zipshp CLI help', "import runpy, sys; sys.argv = ['x', 'zipshp', '-h']; runpy.run_module('scripts.wgms_scripts', run_name='__main__')"),
+]
+
+
+def setup_argument_parser():
+    """Set up command line options.  -h or --help for help is automatic"""
+    p = argparse.ArgumentParser()
+    p.add_argument('-n', '--repeat', type=int, default=5, help='Number of runs of each case')
+    return(p)
+
+
+def time_case(code, repeat):
+    ''' Run code in a fresh interpreter repeat times and return the run times in seconds,
+    or None if the code fails (e.g. a dependency is not installed)
+    '''
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return times
+
+
+def main():
+    p = setup_argument_parser()
+    args = vars(p.parse_args())
+
+    baseline = time_case("pass", args['repeat'])
+    print(f"{'python startup':40s} median {statistics.median(baseline):.3f} s")
+    for name, code in CASES:
+        times = time_case(code, args['repeat'])
+        if times is None:
+            print(f"{name:40s} failed (missing dependency?)")
+        else:
+            print(f"{name:40s} median {statistics.median(times):.3f} s  min {min(times):.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,13 @@
 This script loops through all polygons in an input shapefile and finds ones
 that overlap other polygons.  It saves only the overlapping ones -- either just
 the first of each pair, or both, according to the --both option.
+
+The overlaps are found in a single pass with a spatial index, which gives a table of
+every intersecting pair with the intersection area and both overlap fractions.  With
+--table the table is saved to (or, if it exists, read from) a Parquet file, so other
+--thresh, --use_min and --both choices can be tried without recomputing any geometry.
+A saved table is only reused if it was built from the same input file (path,
+modification time and number of features) and --id_field; otherwise it is rebuilt.
 '''
 
 import os
@@ -11,6 +18,11 @@ from itertools import combinations
 import json
 
 import fiona
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
 from shapely.geometry import shape
 
 
@@ -41,6 +53,8 @@ def setup_argument_parser():
     p.add_argument('-o', '--outfile', default='overlaps.shp',  help='Output shapefile name')
     p.add_argument('-t', '--thresh', type=validated_thresh, default=0.1, help="Threshold of degree of overlap for inclusion")
     p.add_argument('-q', '--quiet', action='store_true', default=False, help="Quiet mode.  Don't print status messages")
+    p.add_argument('--table', default=None, help="Parquet file for the table of overlapping pairs.  Read if it exists and matches --infile, otherwise created")
+    p.add_argument('--id_field', default=None, help="Feature property to store as the id of each shape in the table")
     return(p)
 
 
@@ -48,9 +62,14 @@ def find_overlapping_shapes(polys, thresh=0.1, use_min=False, save_both=False):
     ''' find_overlapping_polys -- find overlapping polygons in the input shapely
     objects and return a list of those entities that overlap.
     '''
+    polys = list(polys)
+    # Build and repair each shape once rather than once per pair
+    geoms = [valid_shape(p) for p in polys]
+
     overlapping_shapes = []
-    for (p1, p2) in combinations(polys, 2):
-        if overlaps(p1, p2, thresh, use_min):
+    for (i, j) in combinations(range(len(polys)), 2):
+        if overlap_fraction(geoms[i], geoms[j], use_min) > thresh:
+            p1, p2 = polys[i], polys[j]
             if p1 not in overlapping_shapes:
                 overlapping_shapes.append(p1)
             if save_both:
@@ -60,25 +79,134 @@ def find_overlapping_shapes(polys, thresh=0.1, use_min=False, save_both=False):
     return overlapping_shapes
 
 
+def valid_shape(p):
+    ''' Build the shapely geometry for feature p, repairing it only if it is invalid
+    '''
+    geom = shape(p['geometry'])
+    if not geom.is_valid:
+        geom = geom.buffer(0)
+    return geom
+
+
+def overlap_fraction(geom1, geom2, use_min):
+    ''' Calculate the overlap fraction between two valid shapely geometries
+    '''
+    inter_area = geom1.intersection(geom2).area
+    if use_min:
+        return min(inter_area/geom1.area, inter_area/geom2.area)
+    return max(inter_area/geom1.area, inter_area/geom2.area)
+
+
 def overlaps(p1, p2, thresh, use_min):
     ''' Calculate overlap between p1 and p2 subject to the input threshold and
     return True or False
     '''
-    geom1 = shape(p1['geometry']).buffer(0)
-    geom2 = shape(p2['geometry']).buffer(0)
-    inter_area = geom1.intersection(geom2).area
+    lap_fraction = overlap_fraction(valid_shape(p1), valid_shape(p2), use_min)
+    return lap_fraction > thresh
+
+
+def overlap_table(polys, id_field=None):
+    ''' overlap_table -- find every pair of intersecting polygons in a single pass
+    with a spatial index and return a table with one row per pair (i < j):
+    i, j: positions of the shapes in polys
+    id_i, id_j: the id_field property of the shapes (the positions if id_field is None)
+    inter_area: area of the intersection
+    frac_i, frac_j: inter_area as a fraction of the area of shape i and of shape j
+    '''
+    polys = list(polys)
+    geoms = np.array([valid_shape(p) for p in polys], dtype=object)
+
+    tree = shapely.STRtree(geoms)
+    i, j = tree.query(geoms, predicate='intersects')
+    keep = i < j
+    i, j = i[keep], j[keep]
+
+    inter_area = shapely.area(shapely.intersection(geoms[i], geoms[j]))
+    areas = shapely.area(geoms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frac_i = inter_area/areas[i]
+        frac_j = inter_area/areas[j]
+
+    if id_field is None:
+        ids = np.arange(len(polys))
+    else:
+        ids = np.array([p['properties'][id_field] for p in polys])
+
+    table = pd.DataFrame({'i': i, 'j': j, 'id_i': ids[i], 'id_j': ids[j],
+                          'inter_area': inter_area, 'frac_i': frac_i, 'frac_j': frac_j})
+    return table.sort_values(['i', 'j']).reset_index(drop=True)
+
+
+def select_from_table(table, thresh=0.1, use_min=False, save_both=False):
+    ''' select_from_table -- positions of the overlapping shapes for a threshold,
+    in the same order that find_overlapping_shapes returns them.  No geometry is
+    computed, so any threshold can be tried quickly on a saved table.
+    '''
     if use_min:
-        lap_fraction = min(inter_area/geom1.area, inter_area/geom2.area)
+        lap_fraction = np.minimum(table['frac_i'].values, table['frac_j'].values)
     else:
-        lap_fraction = max(inter_area/geom1.area, inter_area/geom2.area)
-    return lap_fraction > thresh
+        lap_fraction = np.maximum(table['frac_i'].values, table['frac_j'].values)
+    pairs = table[lap_fraction > thresh].sort_values(['i', 'j'])
+
+    if save_both:
+        # First shape then second shape of each pair, keeping first appearances
+        positions = np.column_stack([pairs['i'].values, pairs['j'].values]).ravel()
+    else:
+        positions = pairs['i'].values
+    return pd.unique(positions)
+
+
+def table_source(infile, n_features, id_field):
+    ''' table_source -- description of the input an overlap table is built from.
+    It is stored in the Parquet metadata so that a saved table is only reused for
+    the same file, features and id field.
+    '''
+    return {'infile': os.path.abspath(infile),
+            'mtime': str(os.path.getmtime(infile)),
+            'n_features': str(n_features),
+            'id_field': id_field or ''}
+
+
+def save_overlap_table(table, table_file, source):
+    ''' save_overlap_table -- save the table to Parquet with its source in the metadata
+    '''
+    pa_table = pa.Table.from_pandas(table, preserve_index=False)
+    metadata = dict(pa_table.schema.metadata or {})
+    metadata.update({('overlap_' + k).encode(): v.encode() for k, v in source.items()})
+    pq.write_table(pa_table.replace_schema_metadata(metadata), table_file)
+
+
+def load_overlap_table(table_file, source):
+    ''' load_overlap_table -- read a saved table, or return None if it was built
+    from a different source than the one given
+    '''
+    pa_table = pq.read_table(table_file)
+    metadata = pa_table.schema.metadata or {}
+    saved = {k: metadata.get(('overlap_' + k).encode(), b'').decode() for k in source}
+    if saved != source:
+        print(f"Overlap table {table_file} was built from {saved}, not {source}.  Rebuilding it.")
+        return None
+    return pa_table.to_pandas()
 
 
 def find_overlaps_in_file(args: dict):
     ''' find_overlaps_in_file -- top-level routine callable with args in simple dictionary
     '''
     with fiona.open(args['infile'], 'r') as f_shapes:
-        overlap_shapes = find_overlapping_shapes(f_shapes, thresh=args['thresh'], use_min=args['use_min'], save_both=args['both'])
+        polys = list(f_shapes)
+
+        table_file = args.get('table')
+        source = table_source(args['infile'], len(polys), args.get('id_field'))
+        table = None
+        if table_file and os.path.exists(table_file):
+            table = load_overlap_table(table_file, source)
+        if table is None:
+            table = overlap_table(polys, id_field=args.get('id_field'))
+            if table_file:
+                save_overlap_table(table, table_file, source)
+
+        positions = select_from_table(table, thresh=args['thresh'], use_min=args['use_min'], save_both=args['both'])
+        overlap_shapes = [polys[k] for k in positions]
 
         print(f"Number of overlapping shapes:  {len(overlap_shapes)}")
 
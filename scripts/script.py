@@ -1,7 +1,7 @@
 # This is from
 # https://stackoverflow.com/questions/47038407/dissolve-overlapping-polygons-with-gdal-ogr-while-keeping-non-connected-result
 import fiona
-from shapely.ops import cascaded_union
+from shapely.ops import unary_union
 from shapely.geometry import shape, mapping
 
 src = '/tmp/polys/glims_region_7_cleaned.shp'
@@ -18,7 +18,7 @@ with fiona.open(src, 'r') as ds_in:
 
         geoms.append(geom)
 
-    dissolved = cascaded_union(geoms)
+    dissolved = unary_union(geoms)
 
 schema = {
     "geometry": "Polygon",
@@ -28,5 +28,6 @@ schema = {
 dst = '/tmp/polys/soutput.shp'
 
 with fiona.open(dst, 'w', driver=drv, schema=schema, crs=crs) as ds_dst:
-    for i, g in enumerate(dissolved):
+    # A single merged polygon isn't a multipolygon, so put it in a list to loop over it
+    for i, g in enumerate(getattr(dissolved, 'geoms', [dissolved])):
         ds_dst.write({"geometry": mapping(g), "properties": {"id": i}})
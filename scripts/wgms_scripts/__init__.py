@@ -0,0 +1,60 @@
+"""
+WGMS Project Module
+Author: Ann Windnagel
+Date: 3/3/2019
+
+This module contains functions that help to process RGI and GLIMS data.
+The functions are split into submodules that are only imported when one of their functions is
+first used, so that e.g. zipshp or print_10_largest_glims don't have to import geopandas,
+shapely and rasterio:
+* fileio: regional file paths, zipshp, atomic outputs and checkpoints (standard library only)
+* reporting: the largest glacier csv files (pandas only)
+* loaders: opening the regional GLIMS and RGI shapefiles
+* geometry: processing the glacier outlines
+* stores: array-backed and time-indexed stores of glacier outlines
+* raster: reproject_raster
+
+All the functions can still be used directly from this module, e.g. ws.pip(...).
+The module can also be run from the command line, see __main__.py.
+"""
+
+import importlib
+
+# Names provided by each submodule
+_SUBMODULE_NAMES = {
+    'fileio': ['RGI_REGION_FILE_NAMES', 'region_file_path', 'zipshp', 'atomic_output', 'load_checkpoint',
+               'save_checkpoint', 'remove_checkpoint'],
+    'reporting': ['print_10_largest_glims', 'print_10_largest_rgi', 'ten_largest', 'save_5_largest',
+                  'ten_largest_icecaps'],
+    'loaders': ['open_rgi_region', 'open_clean_glims', 'multi_temporal_glims', 'find_glacier_all_glims',
+                'find_glacier_clean_glims', 'load_regions'],
+    'geometry': ['pip', 'split_glims', 'clean_glims', 'explode_glaciers', 'dissolve_polygons',
+                 'rgi_date_to_datetime', 'compare_glims_rgi', 'compare_glims_rgi_region', 'repair_geometries', 'validate_geometries',
+                 'open_validated_region', 'RegionLookup', 'simplify_outlines', 'open_simplified_region'],
+    'stores': ['GeometryStore', 'open_geometry_store', 'TemporalGlimsStore', 'open_temporal_glims'],
+    'raster': ['reproject_raster'],
+}
+
+_NAME_TO_SUBMODULE = {name: submodule for submodule, names in _SUBMODULE_NAMES.items() for name in names}
+
+__all__ = list(_NAME_TO_SUBMODULE) + list(_SUBMODULE_NAMES)
+
+
+def __getattr__(name):
+    '''
+    Imports the submodule that provides name the first time it is used
+    '''
+
+    if name in _SUBMODULE_NAMES:
+        return importlib.import_module('.' + name, __name__)
+    if name in _NAME_TO_SUBMODULE:
+        submodule = importlib.import_module('.' + _NAME_TO_SUBMODULE[name], __name__)
+        value = getattr(submodule, name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
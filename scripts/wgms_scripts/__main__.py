@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+'''
+Command line entry point for the WGMS project module. Run from the top of the repository, e.g.
+
+    python -m scripts.wgms_scripts zipshp data/glims/processed/largest/glims_region_1_largest.shp
+    python -m scripts.wgms_scripts largest GLIMS 1
+
+Each command only imports the submodule it needs, so the csv and zip commands start without
+importing geopandas, shapely or rasterio.
+'''
+
+import argparse
+
+
+def run_zipshp(args: dict) -> None:
+    from .fileio import zipshp
+    print(zipshp(args['shapefile'], Delete=not args['keep']))
+
+
+def run_largest(args: dict) -> None:
+    from .reporting import print_10_largest_glims, print_10_largest_rgi
+    if args['source'] == 'GLIMS':
+        print_10_largest_glims(args['region_no'])
+    else:
+        print_10_largest_rgi(args['region_no'])
+
+
+def run_explode(args: dict) -> None:
+    from .geometry import explode_glaciers
+    explode_glaciers(args['region_no'], args['source'], use_simplified=args['simplified'])
+
+
+def run_validate(args: dict) -> None:
+    from .geometry import open_validated_region
+    open_validated_region(args['region_no'], args['source'], method=args['method'])
+
+
+def run_compare(args: dict) -> None:
+    from .geometry import compare_glims_rgi_region
+    compare_glims_rgi_region(args['region_no'], iou_thresh=args['iou_thresh'])
+
+
+def run_reproject(args: dict) -> None:
+    from .raster import reproject_raster
+    reproject_raster(args['inpath'], args['outpath'], args['crs'])
+
+
+def setup_argument_parser():
+    """Set up command line options.  -h or --help for help is automatic"""
+    p = argparse.ArgumentParser(prog='python -m scripts.wgms_scripts')
+    sub = p.add_subparsers(dest='command')
+    sub.required = True
+
+    s = sub.add_parser('zipshp', help='Zip up a shapefile')
+    s.add_argument('shapefile', help='Full path to the shapefile to be zipped')
+    s.add_argument('-k', '--keep', action='store_true', default=False, help='Keep the shapefile files after zipping')
+    s.set_defaults(func=run_zipshp)
+
+    s = sub.add_parser('largest', help='Print the 10 largest glaciers for a region')
+    s.add_argument('source', choices=['GLIMS', 'RGI'])
+    s.add_argument('region_no', type=int)
+    s.set_defaults(func=run_largest)
+
+    s = sub.add_parser('explode', help='Merge all glaciers that touch each other in a region')
+    s.add_argument('source', choices=['GLIMS', 'RGI'])
+    s.add_argument('region_no', type=int)
+    s.add_argument('-s', '--simplified', action='store_true', default=False, help='Use the outlines simplified as a coverage (shapely 2.1 or later)')
+    s.set_defaults(func=run_explode)
+
+    s = sub.add_parser('validate', help='Check and repair the outlines of a region')
+    s.add_argument('source', choices=['GLIMS', 'RGI'])
+    s.add_argument('region_no', type=int)
+    s.add_argument('-m', '--method', choices=['buffer', 'make_valid'], default='buffer', help='Repair method')
+    s.set_defaults(func=run_validate)
+
+    s = sub.add_parser('compare', help='Create the GLIMS vs RGI discrepancy table for a region')
+    s.add_argument('region_no', type=int)
+    s.add_argument('-t', '--iou_thresh', type=float, default=0.5, help='Minimum IoU for an overlap match')
+    s.set_defaults(func=run_compare)
+
+    s = sub.add_parser('reproject', help='Reproject a raster .tif file')
+    s.add_argument('inpath')
+    s.add_argument('outpath')
+    s.add_argument('crs', help="New crs, e.g. 'EPSG:3049'")
+    s.set_defaults(func=run_reproject)
+
+    return(p)
+
+
+def main():
+    p = setup_argument_parser()
+    args = vars(p.parse_args())
+    args['func'](args)
+
+
+if __name__ == '__main__':
+    main()
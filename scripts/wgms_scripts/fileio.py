@@ -0,0 +1,275 @@
+"""
+WGMS Project Module - File paths and file utilities
+Author: Ann Windnagel
+Date: 3/3/2019
+
+This module contains the regional file paths and file utilities. It only uses the standard
+library so that it is quick to import.
+* region_file_path: Returns the file path of a regional GLIMS or RGI shapefile
+* zipshp: zip up shapefiles
+* atomic_output: Writes an output file (or shapefile) under a temporary name and renames it when complete
+* load_checkpoint: Loads the saved progress of a long processing stage
+* save_checkpoint: Saves the progress of a long processing stage
+* remove_checkpoint: Removes the saved progress once a stage has finished
+
+"""
+
+import os
+import pickle
+import zipfile
+from contextlib import contextmanager
+
+
+# List of RGI region shapefile names
+RGI_REGION_FILE_NAMES = ["01_rgi60_Alaska/01_rgi60_Alaska.shp",
+                         "02_rgi60_WesternCanadaUS/02_rgi60_WesternCanadaUS.shp",
+                         "03_rgi60_ArcticCanadaNorth/03_rgi60_ArcticCanadaNorth.shp",
+                         "04_rgi60_ArcticCanadaSouth/04_rgi60_ArcticCanadaSouth.shp",
+                         "05_rgi60_GreenlandPeriphery/05_rgi60_GreenlandPeriphery.shp",
+                         "06_rgi60_Iceland/06_rgi60_Iceland.shp",
+                         "07_rgi60_Svalbard/07_rgi60_Svalbard.shp",
+                         "08_rgi60_Scandinavia/08_rgi60_Scandinavia.shp",
+                         "09_rgi60_RussianArctic/09_rgi60_RussianArctic.shp",
+                         "10_rgi60_NorthAsia/10_rgi60_NorthAsia.shp",
+                         "11_rgi60_CentralEurope/11_rgi60_CentralEurope.shp",
+                         "12_rgi60_CaucasusMiddleEast/12_rgi60_CaucasusMiddleEast.shp",
+                         "13_rgi60_CentralAsia/13_rgi60_CentralAsia.shp",
+                         "14_rgi60_SouthAsiaWest/14_rgi60_SouthAsiaWest.shp",
+                         "15_rgi60_SouthAsiaEast/15_rgi60_SouthAsiaEast.shp",
+                         "16_rgi60_LowLatitudes/16_rgi60_LowLatitudes.shp",
+                         "17_rgi60_SouthernAndes/17_rgi60_SouthernAndes.shp",
+                         "18_rgi60_NewZealand/18_rgi60_NewZealand.shp",
+                         "19_rgi60_AntarcticSubantarctic/19_rgi60_AntarcticSubantarctic.shp",
+                         "05_rgi60_GreenlandPeriphery_clean/05_rgi60_GreenlandPeriphery_clean.shp"]
+
+
+# List of shapefile file extensions
+SHAPEFILE_EXTENSIONS = [".shp",
+                       ".shx",
+                       ".dbf",
+                       ".sbn",
+                       ".sbx",
+                       ".fbn",
+                       ".fbx",
+                       ".ain",
+                       ".aih",
+                       ".atx",
+                       ".ixs",
+                       ".mxs",
+                       ".prj",
+                       ".xml",
+                       ".cpg",
+                       ".shp.xml"]
+
+
+def region_file_path(region_no, source):
+    '''
+    Returns the file path of a regional shapefile
+
+    Parameters
+    ----------
+    region_no : Integer with the region number. Accepted values are 1 through 19 for GLIMS and
+                1 through 20 for RGI. Note that to open the region 5 cleaned shapefile, need set
+                region_no to 20.
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS (cleaned
+              outlines), GLIMS_ALL (all the dated outlines from split_glims) or RGI
+
+    Returns
+    ----------
+    fp : String with the file path
+
+    Raises
+    ----------
+    ValueError : If the source is not accepted or region_no is out of range for the source
+    '''
+
+    if source in ('GLIMS', 'GLIMS_ALL'):
+        max_region_no = 19
+    elif source == 'RGI':
+        max_region_no = len(RGI_REGION_FILE_NAMES)
+    else:
+        raise ValueError("Incorrect source input: " + str(source))
+    if not 1 <= region_no <= max_region_no:
+        raise ValueError("Incorrect region number for " + source + ": " + str(region_no))
+
+    if source == 'GLIMS':
+        fp = "data/glims/processed/cleaned/glims_region_" + str(region_no) + "_cleaned.shp"
+    elif source == 'GLIMS_ALL':
+        fp = "data/glims/processed/glims_region_" + str(region_no) + ".shp"
+    else:
+        fp = "data/rgi/raw/" + RGI_REGION_FILE_NAMES[region_no-1]
+
+    return fp
+
+
+def zipshp(inShp, Delete = True):
+ 
+    """
+    Creates a zip file containing the input shapefile
+    inputs -
+    inShp: Full path to shapefile to be zipped
+    Delete: Set to True to delete shapefile files after zip
+    """
+     
+    #List of shapefile file extensions
+    extensions = SHAPEFILE_EXTENSIONS
+ 
+    #Directory of shapefile
+    inLocation = os.path.dirname (inShp)
+    #Base name of shapefile
+    inName = os.path.basename (os.path.splitext (inShp)[0])
+    #Create zipfile name
+    zipfl = os.path.join (inLocation, inName + ".zip")
+    #Create zipfile object
+    ZIP = zipfile.ZipFile (zipfl, "w")
+ 
+    #Empty list to store files to delete
+    delFiles = []
+     
+    #Iterate files in shapefile directory
+    for fl in os.listdir (inLocation):
+        #Iterate extensions
+        for extension in extensions:
+            #Check if file is shapefile file
+            if fl == inName + extension:
+                #Get full path of file
+                inFile = os.path.join (inLocation, fl)
+                #Add file to delete files list
+                delFiles += [inFile]
+                #Add file to zipfile
+                ZIP.write (inFile, fl)
+                break
+ 
+    #Delete shapefile if indicated
+    if Delete == True:
+        for fl in delFiles:
+            os.remove (fl)
+ 
+    #Close zipfile object
+    ZIP.close()
+ 
+    #Return zipfile full path
+    return zipfl
+
+
+@contextmanager
+def atomic_output(fp):
+    '''
+    Context manager that gives a temporary file path to write an output to in place of fp. When
+    the block finishes without an error, the temporary file is renamed to fp, so fp only ever
+    exists once it is complete and os.path.exists(fp) can be used as a "done" marker.
+    For shapefiles all the side files (.shx, .dbf, .prj, ...) are renamed and the .shp is renamed
+    last. Temporary files left by an earlier failed run are removed first, and if the block fails
+    the temporary files are removed.
+
+    Parameters
+    ----------
+    fp : String containing the path of the output file
+
+    Example
+    ----------
+    with atomic_output(fp) as tmp_fp:
+        glims_region.to_file(driver='ESRI Shapefile', filename=tmp_fp)
+    '''
+
+    out_dir = os.path.dirname(fp)
+    stem, ext = os.path.splitext(os.path.basename(fp))
+    tmp_stem = stem + "_partial"
+    tmp_fp = os.path.join(out_dir, tmp_stem + ext)
+
+    # Only the files the writer can produce are renamed: all the side files for a shapefile,
+    # otherwise just the file itself
+    if ext == ".shp":
+        extensions = SHAPEFILE_EXTENSIONS
+    else:
+        extensions = [ext]
+
+    def remove_tmp_files():
+        for extension in extensions:
+            if os.path.exists(os.path.join(out_dir, tmp_stem + extension)):
+                os.remove(os.path.join(out_dir, tmp_stem + extension))
+
+    # Remove the temporary files left by an earlier run that was killed so they aren't renamed
+    remove_tmp_files()
+
+    try:
+        yield tmp_fp
+    except BaseException:
+        remove_tmp_files()
+        raise
+
+    # Rename the main file last so that fp only exists once all the side files are in place
+    for extension in sorted(extensions, key=lambda extension: extension == ext):
+        if os.path.exists(os.path.join(out_dir, tmp_stem + extension)):
+            os.replace(os.path.join(out_dir, tmp_stem + extension), os.path.join(out_dir, stem + extension))
+
+
+def _checkpoint_path(fp):
+    return fp + ".checkpoint"
+
+
+def _input_signature(input_fp):
+    if input_fp is None:
+        return None
+
+    return os.path.abspath(input_fp), os.path.getmtime(input_fp)
+
+
+def load_checkpoint(fp, input_fp=None):
+    '''
+    Loads the checkpoint saved for the output file fp. If the checkpoint was saved for a different
+    input file, or the input file has changed since (its modification time differs), the
+    checkpoint is removed and None is returned so the stage starts over.
+
+    Parameters
+    ----------
+    fp : String containing the path of the output file of the stage
+    input_fp : Optional string containing the path of the input file of the stage
+
+    Returns
+    ----------
+    state : The object saved with save_checkpoint, or None if there is no usable checkpoint
+    '''
+
+    checkpoint_fp = _checkpoint_path(fp)
+    if not os.path.exists(checkpoint_fp):
+        return None
+
+    with open(checkpoint_fp, "rb") as f:
+        checkpoint = pickle.load(f)
+    if checkpoint.get('input') != _input_signature(input_fp) or 'state' not in checkpoint:
+        print("Discarding " + checkpoint_fp + " as it was saved for a different input")
+        os.remove(checkpoint_fp)
+        return None
+
+    print("Resuming from " + checkpoint_fp)
+    return checkpoint['state']
+
+
+def save_checkpoint(fp, state, input_fp=None):
+    '''
+    Saves the progress of the stage that writes fp. The checkpoint is written to a temporary file
+    and renamed, so a crash while saving leaves the previous checkpoint in place.
+
+    Parameters
+    ----------
+    fp : String containing the path of the output file of the stage
+    state : Any picklable object with what the stage needs to resume
+    input_fp : Optional string containing the path of the input file of the stage. The path and
+               its modification time are saved so load_checkpoint can tell if the input changed.
+    '''
+
+    checkpoint_fp = _checkpoint_path(fp)
+    with open(checkpoint_fp + "_partial", "wb") as f:
+        pickle.dump({'input': _input_signature(input_fp), 'state': state}, f)
+    os.replace(checkpoint_fp + "_partial", checkpoint_fp)
+
+
+def remove_checkpoint(fp):
+    '''
+    Removes the checkpoint for the output file fp once the stage has finished
+    '''
+
+    checkpoint_fp = _checkpoint_path(fp)
+    if os.path.exists(checkpoint_fp):
+        os.remove(checkpoint_fp)
@@ -0,0 +1,924 @@
+"""
+WGMS Project Module - Geometry
+Author: Ann Windnagel
+Date: 3/3/2019
+
+This module contains the functions that process the glacier outlines.
+* pip: Determine if a glacier outline is within a larger glacier region
+* split_glims: Split the glims data into the 19 regions
+* clean_glims: Clean the glims regional files
+* explode_glaciers: merges all glaciers that touch each other
+* dissolve_polygons: Merges the touching polygons in a shapefile with checkpoints
+* compare_glims_rgi: Matches GLIMS and RGI outlines in a region and computes area and date differences
+* compare_glims_rgi_region: Creates the GLIMS vs RGI discrepancy csv file for a region
+* repair_geometries: Repairs only the invalid geometries in an array of shapely geometries
+* validate_geometries: Checks and repairs the outlines of a geodataframe and records the repairs
+* open_validated_region: Opens the validated (repaired) outlines for a region, creating them if needed
+* RegionLookup: In-memory index of the cleaned GTN-G regions for finding the region of points and outlines
+* simplify_outlines: Snaps outline coordinates to a grid and simplifies them within an area error bound
+* open_simplified_region: Opens the simplified outlines for a region, creating them if needed
+
+"""
+
+import geopandas as gpd
+import pandas as pd
+import numpy as np
+import os
+import hashlib
+import fiona
+import shapely
+from shapely.geometry import shape, mapping
+
+from .fileio import RGI_REGION_FILE_NAMES, atomic_output, load_checkpoint, save_checkpoint, remove_checkpoint
+from .loaders import open_rgi_region, open_clean_glims
+
+
+def pip(polygon1, polygon2, buffer_val=0):
+    """
+    Determines if a polygon is within another polygon (pip - polygon in polygon)
+    
+    Parameters
+    ----------
+    polygon1 : A list of polygons in a geopandas dataframe to be tested if they are within polygon2.
+    
+    polygon2 : The polygon (in a geopandas dataframe) for which you want to test if polygon1 lies within it.
+    
+    buffer_val : Optional argument to change the buffer value set on polygon2. Defalut is set to 0. Can input a float or an integer.
+    
+    Returns
+    -------
+    pip_mask : Returns a Series of dtype('bool') with value True for each polygon1 geometry that is within polygon2.
+    """
+    
+    # Repair only the polygons in polygon1 that are invalid. Layers from validate_geometries
+    # are already valid, so this is just a validity check for them.
+    geoms, _, _ = repair_geometries(np.asarray(polygon1.geometry.values))
+    polygon1 = gpd.GeoSeries(geoms, index=polygon1.index, crs=polygon1.crs)
+
+    # Check if the list of polygons in polygon1 is within polygon2
+    pip_mask = polygon1.within(polygon2.loc[0, 'geometry'].buffer(buffer_val))
+    
+    return pip_mask
+
+
+def split_glims(data, all_regions, region_name, fp, chunk_size=50000):
+    """
+    Determines which glacier outlines, from the large GLIMS data file, belong to the specified region.
+    Then saves the outlines that reside in that region to its own shapefile for later use.
+    The outlines are tested in chunks and the progress is checkpointed after each chunk, so a rerun
+    after a crash resumes from the last chunk. The shapefile is written under a temporary name and
+    renamed when complete.
+
+    Parameters
+    ----------
+    data : Geodataframe containing polygons of all the GLIMS data
+    all_regions : Geodataframe containing outlines of the 19 glacier regions.
+    region_name : String containing the name of the region
+    fp : String containing the file path to the location where the region shapefile should be saved.
+    chunk_size : Optional integer with the number of outlines tested between checkpoints. Default is 50000.
+
+    Returns
+    -------
+    Nothing. Saves the outlines that reside in the specified region to its own shapefile.
+    """
+    
+    # Select specified region from the regions dataframe and reset index to zero so that it works in pip
+    region = all_regions[all_regions.FULL_NAME == region_name]
+    region.reset_index(drop=True, inplace=True)
+    
+    # Determine which GLIMS outlines reside in specified region, one chunk at a time
+    checkpoint = load_checkpoint(fp) or {'next_row': 0, 'rows': []}
+    for start in range(checkpoint['next_row'], len(data), chunk_size):
+        pip_mask = pip(data.iloc[start:start + chunk_size], region)
+        checkpoint['rows'].extend(start + np.flatnonzero(pip_mask.values))
+        checkpoint['next_row'] = start + chunk_size
+        save_checkpoint(fp, checkpoint)
+
+    # Get the ones that are in the specified region
+    glims_region = data.iloc[checkpoint['rows']]
+    
+    print(region.RGI_CODE[0])
+    
+    glims_region.insert(0, 'region_no', region.RGI_CODE[0])
+
+    # Save regional dataframe to shapefile
+    with atomic_output(fp) as tmp_fp:
+        glims_region.to_file(driver='ESRI Shapefile', filename=tmp_fp)
+    remove_checkpoint(fp)
+    
+    return
+
+
+def clean_glims(region_glims, fp, checkpoint_every=1000):
+    """
+    Clean each GLIMS regional file: pull out only the glacier boundaries, remove extra columns, find latest date.
+    Then save the cleaned outlines to its own shapefile for later use.
+    The rows kept so far are checkpointed every checkpoint_every glaciers, so a rerun after a crash
+    resumes from the last checkpoint. The shapefile is written under a temporary name and renamed
+    when complete.
+
+    Parameters
+    ----------
+    region_glims : Geodataframe containing polygons for one region of GLIMS data
+    fp : String containing the file path to the location where the region shapefile should be saved.
+    checkpoint_every : Optional integer with the number of glaciers processed between checkpoints. Default is 1000.
+
+    Returns
+    -------
+    Nothing. Saves the cleaned outlines to its own shapefile.
+    """
+    
+    # Extract the glacier outlines: line_type = glac_bound
+    glac_bounds = region_glims[region_glims['line_type']=='glac_bound']
+    
+    # Extract region number from the filepath (fp). Note this code is only being added to address the Region 13 GLIMS issue
+    region_no = fp[42:44]
+    
+    # Remove columns the are unneeded
+    glac_bounds_trimmed = glac_bounds.drop(
+                          ['line_type', 'anlys_id', 'anlys_time', 'rec_status', 'wgms_id', 
+                          'local_id', 'glac_stat', 'subm_id', 'release_dt', 'proc_desc', 'rc_id', 
+                          'geog_area', 'chief_affl', 'loc_unc_x', 'loc_unc_y', 'glob_unc_x', 
+                          'glob_unc_y', 'submitters', 'analysts'], axis=1)
+    
+    # Find the unique glaciers in region 1 by glac_id
+    unique_glaciers = glac_bounds_trimmed.glac_id.unique()
+    
+    # Find the latest date for each unique glacier and keep the index labels of just those rows
+    checkpoint = load_checkpoint(fp) or {'next_glacier': 0, 'labels': []}
+    for counter in range(checkpoint['next_glacier'], len(unique_glaciers)):
+        unique = unique_glaciers[counter]
+        glacier = glac_bounds_trimmed[glac_bounds_trimmed['glac_id'] == unique]
+        glacier_latest_date = glacier['src_date'].max()
+        # Remove erroneous glaciers in GLIMS Region 13 (G072126E38989N glacier).
+        # See the 9-analyze-region-13-asia-central notebook for details.
+        if (counter > 0) and (region_no == '13') and (unique == 'G072126E38989N'):
+            print('Fixing G072126E38989N')
+            glacier = glacier.drop([10927, 98745])
+            glacier_latest_date = glacier['src_date'].max()
+            print(glacier_latest_date)
+        checkpoint['labels'].extend(glacier.index[glacier['src_date'] == glacier_latest_date])
+
+        if (counter + 1) % checkpoint_every == 0:
+            checkpoint['next_glacier'] = counter + 1
+            save_checkpoint(fp, checkpoint)
+
+    glacier_latest_df = glac_bounds_trimmed.loc[checkpoint['labels']]
+            
+    # Save cleaned dataframe to a shapefile
+    with atomic_output(fp) as tmp_fp:
+        glacier_latest_df.to_file(driver='ESRI Shapefile', filename=tmp_fp)
+    remove_checkpoint(fp)
+    
+    return
+
+
+def explode_glaciers(region_no, source, use_simplified=False, chunk_size=5000):
+    '''
+    Explodes (merges) all glacier polygons that touch one another into one polygon to create a glacier catchment.
+    Adapted from:
+    https://stackoverflow.com/questions/47038407/dissolve-overlapping-polygons-with-gdal-ogr-while-keeping-non-connected-result
+    
+    Parameters
+    ----------
+    region_no : Integer region number of the region with the polygons that need to be exploded.
+                Accepted values are 1 through 19 for GLIMS and 1 through 20 for RGI. 
+                Note that to open the region 5 cleaned shapefile, need set region_no to 20.
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS or RGI
+    use_simplified : Optional boolean. If True, explode the outlines simplified as a coverage by
+                     open_simplified_region(..., coverage=True) instead, so that the divides
+                     between glaciers still match and no slivers are left when they are merged.
+                     Uses the default simplification settings and needs shapely 2.1 or later.
+                     Raises a ValueError for the GLIMS region 19 Huber data, which has no
+                     validated outlines to simplify. The output file name gets a _simplified
+                     suffix. Default is False.
+    chunk_size : Optional integer with the number of polygons merged between checkpoints. See
+                 dissolve_polygons. Default is 5000.
+    
+    Returns
+    ----------
+    nothing: Saves a file of exploded shapefiles
+    '''
+    if source == 'GLIMS':
+        if use_simplified and region_no == 19:
+            raise ValueError("use_simplified is not available for the GLIMS region 19 Huber data")
+
+        # Set up output filename
+        if region_no == 19:
+            output_fn = "data/glims/processed/ice-caps/exploded/exploded_huber_" + str(region_no) + ".shp"
+        else:
+            output_fn = "data/glims/processed/ice-caps/exploded/exploded_" + str(region_no) + ".shp"
+            if use_simplified:
+                output_fn = output_fn.replace(".shp", "_simplified.shp")
+    
+        # Check that the region hasn't already been processed
+        if os.path.exists(output_fn) == False:
+            print(str(source) + " " + str(region_no))
+            if region_no == 19:
+                filename = "data/glims/processed/cleaned/glims_region_" + str(region_no) + "_huber_cleaned.shp"
+            else:
+                filename = "data/glims/processed/cleaned/glims_region_" + str(region_no) + "_cleaned.shp"
+                # Use the validated outlines if they exist so the repairs aren't redone
+                validated_fn = _validated_region_path(region_no, source)
+                if os.path.exists(validated_fn):
+                    filename = validated_fn
+                if use_simplified:
+                    open_simplified_region(region_no, source, coverage=True)
+                    filename = _simplified_region_path(region_no, source, coverage=True)
+
+            dissolve_polygons(filename, output_fn, chunk_size=chunk_size)
+        else:
+            print(str(source) + " Region " + str(region_no) + " has already been processed")
+            
+    elif source == 'RGI':
+        # Set up RGI output filename
+        if region_no == 20:
+            output_fn = "data/rgi/processed/ice-caps/exploded/exploded_clean_5.shp"
+        else:
+            output_fn = "data/rgi/processed/ice-caps/exploded/exploded_" + str(region_no) + ".shp"
+        if use_simplified:
+            output_fn = output_fn.replace(".shp", "_simplified.shp")
+        
+    
+        # Check that the region hasn't already been processed
+        if os.path.exists(output_fn) == False:
+            print(str(source) + " " + str(region_no))
+            filename = "data/rgi/raw/" + RGI_REGION_FILE_NAMES[region_no-1]
+            # Use the validated outlines if they exist so the repairs aren't redone
+            validated_fn = _validated_region_path(region_no, source)
+            if os.path.exists(validated_fn):
+                filename = validated_fn
+            if use_simplified:
+                open_simplified_region(region_no, source, coverage=True)
+                filename = _simplified_region_path(region_no, source, coverage=True)
+            print(filename)
+
+            dissolve_polygons(filename, output_fn, chunk_size=chunk_size)
+        else:
+            print(str(source) + " Region " + str(region_no) + " has already been processed")
+            
+    else:
+        print("Incorrect source input")
+            
+    return
+
+
+def _union_repaired(geoms):
+    # Invalid outlines make union_all fail, so repair them the same way as open_validated_region
+    repaired_geoms, _, _ = repair_geometries(np.array(geoms, dtype=object))
+
+    return shapely.union_all(repaired_geoms)
+
+
+def dissolve_polygons(filename, output_fn, chunk_size=5000):
+    '''
+    Merges all the polygons in a shapefile that touch one another and saves each merged polygon as
+    its own feature. The polygons are merged chunk_size at a time and the merged chunks are
+    checkpointed, so a rerun after a crash only redoes the current chunk (the checkpoint is
+    discarded if filename has changed since it was saved). The chunks are then merged
+    together, which gives the same result as merging all the polygons at once. The output is written
+    under a temporary name and renamed when complete.
+
+    Parameters
+    ----------
+    filename : String containing the path to the input shapefile
+    output_fn : String containing the path to the output shapefile
+    chunk_size : Optional integer with the number of polygons merged between checkpoints. Default is 5000.
+
+    Returns
+    ----------
+    nothing: Saves a shapefile of the merged polygons
+    '''
+
+    checkpoint = load_checkpoint(output_fn, filename) or {'next_feature': 0, 'partial_unions': []}
+
+    with fiona.open(filename, 'r') as ds_in:
+        crs = ds_in.crs
+        drv = ds_in.driver
+
+        geoms = []
+        for counter, x in enumerate(ds_in):
+            # Skip the features that were merged before the checkpoint
+            if counter < checkpoint['next_feature']:
+                continue
+
+            geoms.append(shape(x["geometry"]))
+
+            if len(geoms) == chunk_size:
+                checkpoint['partial_unions'].append(shapely.to_wkb(_union_repaired(geoms)))
+                checkpoint['next_feature'] = counter + 1
+                save_checkpoint(output_fn, checkpoint, filename)
+                geoms = []
+
+    dissolved = shapely.union_all([_union_repaired(geoms)] + list(shapely.from_wkb(checkpoint['partial_unions'])))
+
+    schema = {
+        "geometry": "Polygon",
+        "properties": {"id": "int"}
+    }
+
+    with atomic_output(output_fn) as tmp_fn:
+        with fiona.open(tmp_fn, 'w', driver=drv, schema=schema, crs=crs) as ds_dst:
+            # A single merged polygon isn't a multipolygon, so put it in a list to loop over it
+            for i, g in enumerate(getattr(dissolved, 'geoms', [dissolved])):
+                ds_dst.write({"geometry": mapping(g), "properties": {"id": i}})
+    remove_checkpoint(output_fn)
+
+    return
+
+
+def rgi_date_to_datetime(bgn_date):
+    '''
+    Converts the RGI BgnDate column (YYYYMMDD strings) to datetimes.
+    RGI uses -9999999 for an unknown date and 99 for an unknown month or day. An unknown
+    month is set to July and an unknown day is set to the 15th so the date falls in the middle
+    of the known period.
+
+    Parameters
+    ----------
+    bgn_date : Series containing the RGI BgnDate values
+
+    Returns
+    ----------
+    rgi_dates : Series of datetimes. Unknown dates are NaT.
+    '''
+
+    bgn_date = bgn_date.astype(str).str.strip()
+    year = bgn_date.str[0:4]
+    month = bgn_date.str[4:6].replace('99', '07')
+    day = bgn_date.str[6:8].replace('99', '15')
+    rgi_dates = pd.to_datetime(year + month + day, format='%Y%m%d', errors='coerce')
+
+    return rgi_dates
+
+
+def compare_glims_rgi(glims_df, rgi_df, region_no, iou_thresh=0.5):
+    '''
+    Matches the GLIMS and RGI outlines for a region and computes the area and date
+    differences between them for every glacier in the region.
+    Glaciers are first joined on the GLIMS id (glac_id in GLIMS, GLIMSId in RGI). The
+    glaciers that are left over are matched by overlap: a spatial index finds the candidate
+    pairs that intersect and the pair with the largest intersection over union (IoU) is
+    kept if it is at least iou_thresh. Each glacier is matched at most once.
+
+    Parameters
+    ----------
+    glims_df : Geodataframe containing the cleaned GLIMS polygons for a region
+    rgi_df : Geodataframe containing the RGI polygons for the same region
+    region_no : Integer with the region number. Accepted values are 1 through 19.
+    iou_thresh : Optional float with the minimum IoU for an overlap match. Default is 0.5.
+
+    Returns
+    ----------
+    discrepancy_df : A pandas dataframe with one row per glacier. match_type is 'id' or
+                     'overlap' for matched glaciers and 'glims_only' or 'rgi_only' for
+                     glaciers found in one inventory only.
+    '''
+
+    # Keep one outline per glacier (the largest) so that each glacier is matched once
+    glims = glims_df[['glac_id', 'glac_name', 'db_area', 'src_date', 'geometry']]
+    glims = glims.sort_values('db_area', ascending=False).drop_duplicates('glac_id')
+    glims = glims.reset_index(drop=True)
+    rgi = rgi_df[['RGIId', 'GLIMSId', 'Name', 'Area', 'BgnDate', 'geometry']]
+    rgi = rgi.sort_values('Area', ascending=False).drop_duplicates('RGIId')
+    rgi = rgi.reset_index(drop=True)
+
+    # Repair invalid outlines once, up front, so that the overlay below doesn't fail
+    glims_geoms, _, _ = repair_geometries(np.asarray(glims.geometry.values))
+    rgi_geoms, _, _ = repair_geometries(np.asarray(rgi.geometry.values))
+
+    # Match on the GLIMS id
+    glims_pos = pd.Series(np.arange(len(glims)), index=glims['glac_id'])
+    rgi_id_pos = np.flatnonzero(rgi['GLIMSId'].isin(glims_pos.index).values)
+    glims_id_pos = glims_pos.loc[rgi['GLIMSId'].values[rgi_id_pos]].values
+    id_pairs = pd.DataFrame({'glims_pos': glims_id_pos, 'rgi_pos': rgi_id_pos})
+    id_pairs = id_pairs.drop_duplicates('glims_pos')
+    id_pairs['match_type'] = 'id'
+
+    # Match the rest on overlap with the spatial index
+    glims_left = np.setdiff1d(np.arange(len(glims)), id_pairs['glims_pos'].values)
+    rgi_left = np.setdiff1d(np.arange(len(rgi)), id_pairs['rgi_pos'].values)
+    tree = shapely.STRtree(glims_geoms[glims_left])
+    rgi_idx, glims_idx = tree.query(rgi_geoms[rgi_left], predicate='intersects')
+    overlap_pairs = pd.DataFrame({'glims_pos': glims_left[glims_idx], 'rgi_pos': rgi_left[rgi_idx]})
+    overlap_pairs['iou'] = _iou(glims_geoms[overlap_pairs['glims_pos'].values],
+                                rgi_geoms[overlap_pairs['rgi_pos'].values])
+    overlap_pairs = overlap_pairs[overlap_pairs['iou'] >= iou_thresh]
+    overlap_pairs = overlap_pairs.sort_values('iou', ascending=False)
+    overlap_pairs = overlap_pairs.drop_duplicates('glims_pos').drop_duplicates('rgi_pos')
+    overlap_pairs['match_type'] = 'overlap'
+
+    id_pairs['iou'] = _iou(glims_geoms[id_pairs['glims_pos'].values],
+                           rgi_geoms[id_pairs['rgi_pos'].values])
+    pairs = pd.concat([id_pairs, overlap_pairs], ignore_index=True, sort=False)
+
+    # Build the table of matched glaciers
+    glims_attrs = pd.DataFrame(glims.drop(columns='geometry'))
+    rgi_attrs = pd.DataFrame(rgi.drop(columns='geometry'))
+    matched = pd.concat([glims_attrs.iloc[pairs['glims_pos'].values].reset_index(drop=True),
+                         rgi_attrs.iloc[pairs['rgi_pos'].values].reset_index(drop=True),
+                         pairs[['match_type', 'iou']].reset_index(drop=True)], axis=1)
+
+    # Add the glaciers that are only in one of the inventories
+    glims_only = glims_attrs.drop(index=pairs['glims_pos'].values)
+    glims_only['match_type'] = 'glims_only'
+    rgi_only = rgi_attrs.drop(index=pairs['rgi_pos'].values)
+    rgi_only['match_type'] = 'rgi_only'
+    discrepancy_df = pd.concat([matched, glims_only, rgi_only], ignore_index=True, sort=False)
+
+    # Compute the area and date differences for all glaciers at once
+    glims_dates = pd.to_datetime(discrepancy_df['src_date'], errors='coerce')
+    rgi_dates = rgi_date_to_datetime(discrepancy_df['BgnDate'])
+    discrepancy_df['area_diff'] = discrepancy_df['db_area'] - discrepancy_df['Area']
+    discrepancy_df['area_diff_pct'] = 100 * discrepancy_df['area_diff'] / discrepancy_df['Area']
+    discrepancy_df['date_diff_days'] = (glims_dates - rgi_dates).dt.days
+    discrepancy_df.insert(0, 'region_no', region_no)
+
+    return discrepancy_df
+
+
+def _iou(geoms1, geoms2):
+    '''
+    Intersection over union for two equal length arrays of shapely geometries
+    '''
+
+    inter_area = shapely.area(shapely.intersection(geoms1, geoms2))
+    union_area = shapely.area(geoms1) + shapely.area(geoms2) - inter_area
+    with np.errstate(divide='ignore', invalid='ignore'):
+        iou = np.where(union_area > 0, inter_area / union_area, 0.0)
+
+    return iou
+
+
+def compare_glims_rgi_region(region_no, iou_thresh=0.5):
+    '''
+    Compares the cleaned GLIMS and the RGI outlines for a region and saves the discrepancy
+    table to a csv file
+
+    Parameters
+    ----------
+    region_no : Integer with the region number. Accepted values are 1 through 19.
+    iou_thresh : Optional float with the minimum IoU for an overlap match. Default is 0.5.
+
+    Returns
+    ----------
+    discrepancy_df : A pandas dataframe with the discrepancy table for the region
+    '''
+
+    compare_csv_fp = "data/compare/glims_rgi_region_" + str(region_no) + "_compare.csv"
+    if os.path.exists(compare_csv_fp):
+        print("GLIMS vs RGI Region " + str(region_no) + " compare CSV file already exists")
+        return pd.read_csv(compare_csv_fp)
+
+    glims_df = open_clean_glims(region_no)
+    rgi_df = open_rgi_region(region_no)
+    if region_no == 5:
+        # Select glaciers that have connectivity level of 0 or 1
+        rgi_df = rgi_df.loc[(rgi_df['Connect'] == 0) | (rgi_df['Connect'] == 1)]
+
+    discrepancy_df = compare_glims_rgi(glims_df, rgi_df, region_no, iou_thresh=iou_thresh)
+
+    print(region_no)
+    with atomic_output(compare_csv_fp) as tmp_fp:
+        discrepancy_df.to_csv(tmp_fp, index=False)
+
+    return discrepancy_df
+
+
+def repair_geometries(geoms, method='buffer'):
+    '''
+    Checks the validity of an array of shapely geometries and repairs only the invalid ones.
+
+    Parameters
+    ----------
+    geoms : Numpy array of shapely geometries
+    method : Optional string with the repair method. Accepted values are 'buffer' (buffer(0),
+             the method used throughout this project) or 'make_valid'. Default is 'buffer'.
+
+    Returns
+    ----------
+    repaired_geoms : Numpy array with the invalid geometries replaced by their repaired versions
+    invalid_mask : Numpy boolean array, True for each geometry that was repaired
+    reasons : Numpy array of strings with the reason each geometry was invalid ('' if valid)
+    '''
+
+    invalid_mask = ~shapely.is_valid(geoms)
+    repaired_geoms = geoms.copy()
+    reasons = np.full(len(geoms), '', dtype=object)
+    if not invalid_mask.any():
+        return repaired_geoms, invalid_mask, reasons
+
+    invalid_geoms = geoms[invalid_mask]
+    reasons[invalid_mask] = shapely.is_valid_reason(invalid_geoms)
+    if method == 'buffer':
+        repaired_geoms[invalid_mask] = shapely.buffer(invalid_geoms, 0)
+    elif method == 'make_valid':
+        # make_valid can return lines and points along with the polygons (e.g. for a
+        # collapsed ring). A buffer(0) of the result keeps only the polygon parts.
+        fixed = shapely.make_valid(invalid_geoms)
+        not_polygonal = ~np.isin(shapely.get_type_id(fixed), [3, 6])
+        fixed[not_polygonal] = shapely.buffer(fixed[not_polygonal], 0)
+        repaired_geoms[invalid_mask] = fixed
+    else:
+        raise ValueError("Incorrect repair method: " + str(method))
+
+    return repaired_geoms, invalid_mask, reasons
+
+
+def validate_geometries(data, method='buffer'):
+    '''
+    Checks the validity of all the outlines in a geodataframe and repairs only the invalid ones.
+    The columns repaired (1 if the outline was repaired) and inv_reason (why it was invalid) are
+    added so that the repairs can be reviewed. The names are kept short for shapefiles.
+
+    Parameters
+    ----------
+    data : Geodataframe containing glacier polygons
+    method : Optional string with the repair method, 'buffer' or 'make_valid'. Default is 'buffer'.
+
+    Returns
+    ----------
+    validated_df : Geodataframe with the repaired outlines and the repaired and inv_reason columns
+    '''
+
+    geoms, invalid_mask, reasons = repair_geometries(np.asarray(data.geometry.values), method=method)
+
+    validated_df = data.copy()
+    validated_df['repaired'] = invalid_mask.astype(int)
+    validated_df['inv_reason'] = reasons
+    validated_df = validated_df.set_geometry(gpd.GeoSeries(geoms, index=data.index, crs=data.crs))
+
+    print("Repaired " + str(invalid_mask.sum()) + " of " + str(len(data)) + " outlines")
+
+    return validated_df
+
+
+def _validated_region_path(region_no, source, method='buffer'):
+    if source == 'GLIMS':
+        validated_fp = "data/glims/processed/validated/glims_region_" + str(region_no) + "_validated"
+    elif source == 'RGI':
+        validated_fp = "data/rgi/processed/validated/rgi_region_" + str(region_no) + "_validated"
+    else:
+        return None
+
+    return validated_fp + "_" + method + ".shp"
+
+
+def open_validated_region(region_no, source, method='buffer'):
+    '''
+    Opens the validated outlines for a region. The first time a region is opened with a repair
+    method its outlines are validated with validate_geometries and saved, so the repair is only
+    ever done once. The method is part of the file name (e.g. glims_region_1_validated_buffer.shp),
+    so outlines repaired with the other method are never returned.
+
+    Parameters
+    ----------
+    region_no : Integer with the region number. Accepted values are 1 through 19 for GLIMS and
+                1 through 20 for RGI. Note that to open the region 5 cleaned shapefile, need set
+                region_no to 20.
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS or RGI
+    method : Optional string with the repair method, 'buffer' or 'make_valid'. Default is 'buffer'.
+
+    Returns
+    ----------
+    validated_df : Geodataframe with the validated outlines for the region
+    '''
+
+    validated_fp = _validated_region_path(region_no, source, method)
+    if validated_fp is None:
+        print("Incorrect source input")
+        return
+
+    if os.path.exists(validated_fp):
+        return gpd.read_file(validated_fp)
+
+    if source == 'GLIMS':
+        data = open_clean_glims(region_no)
+    else:
+        data = open_rgi_region(region_no)
+
+    print("Creating file " + validated_fp)
+    validated_df = validate_geometries(data, method=method)
+    with atomic_output(validated_fp) as tmp_fp:
+        validated_df.to_file(driver='ESRI Shapefile', filename=tmp_fp)
+
+    return validated_df
+
+
+class RegionLookup:
+    '''
+    In-memory index of the 19 cleaned GTN-G glacier regions for finding which region points and
+    glacier outlines belong to, so that the regions shapefile doesn't have to be reopened and
+    filtered by FULL_NAME for every query.
+
+    The world is divided into a grid of cells of cell_size degrees. Each cell is classified once as
+    inside a single region, outside all regions, or on a region boundary, and the grid is cached
+    to a .npy file next to the regions shapefile, keyed by the cell size and a hash of the regions
+    file. Points and outlines that fall in interior cells are assigned with a table lookup. Only
+    the ones on a boundary are tested exactly against the prepared region polygons.
+
+    Parameters
+    ----------
+    regions_fp : Optional string with the path to the cleaned GTN-G regions shapefile.
+    cell_size : Optional float with the grid cell size in degrees. Default is 1.
+
+    Example
+    ----------
+    lookup = RegionLookup()
+    glims_polygons.insert(0, 'region_no', lookup.region_of(glims_polygons.geometry))
+    '''
+
+    # Cell codes for cells that aren't inside a single region
+    OUTSIDE = 0
+    BOUNDARY = -1
+
+    def __init__(self, regions_fp="data/gtn-g-glacier-regions/cleaned/GTN-G_glacier_regions_201707_cleaned.shp",
+                 cell_size=1.0):
+        self.regions = gpd.read_file(regions_fp)
+        self.codes = self.regions['RGI_CODE'].astype(int).values
+        self.cell_size = cell_size
+        self.ny = int(np.ceil(180 / cell_size))
+        self.nx = int(np.ceil(360 / cell_size))
+
+        # Prepared region polygons in a spatial index for the exact tests
+        self.geoms = np.asarray(self.regions.geometry.values)
+        shapely.prepare(self.geoms)
+        self.tree = shapely.STRtree(self.geoms)
+
+        # The cached grid is keyed by a hash of the regions file contents so that a regenerated
+        # regions shapefile never reuses a grid made from the old regions
+        regions_hash = hashlib.md5()
+        for ext in [".shp", ".dbf"]:
+            with open(os.path.splitext(regions_fp)[0] + ext, "rb") as f:
+                regions_hash.update(f.read())
+        grid_fp = (os.path.splitext(regions_fp)[0] + "_grid_" + str(cell_size) + "_"
+                   + regions_hash.hexdigest()[:12] + ".npy")
+        if os.path.exists(grid_fp):
+            self.grid = np.load(grid_fp)
+        else:
+            self.grid = self._classify_cells()
+            np.save(grid_fp, self.grid)
+
+        # Summed area table of the interior cells of each region so that an outline's bounding box
+        # can be checked for lying fully inside one region in constant time
+        interior = self.grid[np.newaxis, :, :] == np.arange(self.codes.max() + 1)[:, np.newaxis, np.newaxis]
+        self.interior_sums = np.zeros((interior.shape[0], self.ny + 1, self.nx + 1), dtype=np.int32)
+        self.interior_sums[:, 1:, 1:] = interior.cumsum(axis=1).cumsum(axis=2)
+
+    def _classify_cells(self):
+        '''
+        Classifies every grid cell as inside a region (the region's RGI_CODE), outside all
+        regions (OUTSIDE), or crossing a region boundary (BOUNDARY)
+        '''
+
+        rows, cols = np.divmod(np.arange(self.ny * self.nx), self.nx)
+        cells = shapely.box(cols * self.cell_size - 180, rows * self.cell_size - 90,
+                            (cols + 1) * self.cell_size - 180, (rows + 1) * self.cell_size - 90)
+
+        grid = np.full(self.ny * self.nx, self.OUTSIDE, dtype=np.int16)
+        cell_idx, _ = self.tree.query(cells, predicate='intersects')
+        grid[cell_idx] = self.BOUNDARY
+        cell_idx, region_idx = self.tree.query(cells, predicate='within')
+        grid[cell_idx] = self.codes[region_idx]
+
+        return grid.reshape(self.ny, self.nx)
+
+    def _cell_index(self, x, y):
+        '''
+        Grid row and column for arrays of longitudes (x) and latitudes (y)
+        '''
+
+        rows = np.clip(np.floor((np.asarray(y) + 90) / self.cell_size).astype(int), 0, self.ny - 1)
+        cols = np.clip(np.floor((np.asarray(x) + 180) / self.cell_size).astype(int), 0, self.nx - 1)
+
+        return rows, cols
+
+    def region_of_xy(self, x, y):
+        '''
+        Finds the region of each point given as arrays of coordinates
+
+        Parameters
+        ----------
+        x : Array of longitudes in degrees
+        y : Array of latitudes in degrees
+
+        Returns
+        ----------
+        region_codes : Numpy integer array with the RGI_CODE of the region each point lies in,
+                       0 for points outside all regions or with missing (NaN) coordinates
+        '''
+
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+
+        # Points with missing coordinates stay OUTSIDE. NaN can't be turned into a cell index.
+        finite = np.isfinite(x) & np.isfinite(y)
+        region_codes = np.full(len(x), self.OUTSIDE, dtype=int)
+        rows, cols = self._cell_index(x[finite], y[finite])
+        region_codes[finite] = self.grid[rows, cols]
+
+        # Exact test only for the points in boundary cells
+        boundary = np.flatnonzero(region_codes == self.BOUNDARY)
+        region_codes[boundary] = self.OUTSIDE
+        if len(boundary) > 0:
+            points = shapely.points(x[boundary], y[boundary])
+            point_idx, region_idx = self.tree.query(points, predicate='within')
+            region_codes[boundary[point_idx]] = self.codes[region_idx]
+
+        return region_codes
+
+    def region_of(self, geoms):
+        '''
+        Finds the region of each point or outline. An outline belongs to a region if it lies
+        within it, which matches how split_glims assigns the GLIMS outlines to regions.
+
+        Parameters
+        ----------
+        geoms : GeoSeries or array of shapely points or polygons
+
+        Returns
+        ----------
+        region_codes : Numpy integer array with the RGI_CODE of each geometry's region,
+                       0 for geometries that are not within a region and for empty or missing
+                       geometries
+        '''
+
+        geoms = np.asarray(geoms)
+        region_codes = np.full(len(geoms), self.OUTSIDE, dtype=int)
+
+        # Empty and missing geometries (e.g. outlines that collapsed in a buffer(0) repair) have NaN
+        # bounds, so they stay OUTSIDE rather than going through the grid lookup
+        usable = ~(shapely.is_empty(geoms) | shapely.is_missing(geoms))
+
+        is_point = usable & (shapely.get_type_id(geoms) == 0)
+        if is_point.any():
+            region_codes[is_point] = self.region_of_xy(shapely.get_x(geoms[is_point]),
+                                                       shapely.get_y(geoms[is_point]))
+
+        polys = np.flatnonzero(usable & ~is_point)
+        if len(polys) == 0:
+            return region_codes
+
+        # An outline whose bounding box covers only interior cells of one region lies within it
+        bounds = shapely.bounds(geoms[polys])
+        row0, col0 = self._cell_index(bounds[:, 0], bounds[:, 1])
+        row1, col1 = self._cell_index(bounds[:, 2], bounds[:, 3])
+        candidate = np.clip(self.grid[row0, col0], 0, None)
+        sums = self.interior_sums
+        n_interior = (sums[candidate, row1 + 1, col1 + 1] - sums[candidate, row0, col1 + 1]
+                      - sums[candidate, row1 + 1, col0] + sums[candidate, row0, col0])
+        n_cells = (row1 - row0 + 1) * (col1 - col0 + 1)
+        interior = (candidate > 0) & (n_interior == n_cells)
+        region_codes[polys[interior]] = candidate[interior]
+
+        # Exact test for the rest
+        rest = polys[~interior]
+        if len(rest) > 0:
+            geom_idx, region_idx = self.tree.query(geoms[rest], predicate='within')
+            region_codes[rest[geom_idx]] = self.codes[region_idx]
+
+        return region_codes
+
+
+def simplify_outlines(data, grid_size=1e-6, tolerance=1e-4, max_area_error=0.01, max_tries=5, coverage=False):
+    '''
+    Reduces the number of vertices in glacier outlines so that within, intersection and union run
+    faster on them. Coordinates are snapped to a grid of grid_size and the outlines are simplified
+    with a topology preserving simplification. Any outline whose area changes by more than
+    max_area_error is simplified again with half the tolerance, up to max_tries times, and is kept
+    as the snapped outline if it still changes too much.
+
+    By default each outline is simplified on its own, so two glaciers that share a divide can end
+    up with different versions of it. That is fine for pip and overlap tests, but merging such
+    outlines leaves slivers along the divides. With coverage=True the whole layer is simplified
+    together with shapely.coverage_simplify (shapely 2.1 or later), which keeps shared boundaries
+    identical. The tolerance is then halved for the whole layer until every outline is within
+    max_area_error, and the snapped outlines are kept if it never is. Use this for outlines that
+    will be merged, e.g. by explode_glaciers.
+    The columns n_vert_in, n_vert_out and area_chg (fractional area change) are added for each
+    outline. The names are kept short for shapefiles.
+
+    Parameters
+    ----------
+    data : Geodataframe containing valid glacier polygons, e.g. from open_validated_region
+    grid_size : Optional float with the grid size to snap coordinates to, in the units of the
+                data crs. Default is 1e-6 degrees (about 0.1 m).
+    tolerance : Optional float with the simplification tolerance, in the units of the data crs.
+                Default is 1e-4 degrees (about 10 m).
+    max_area_error : Optional float with the largest allowed fractional area change per outline.
+                     Default is 0.01 (1%).
+    max_tries : Optional integer with the number of times the tolerance is halved. Default is 5.
+    coverage : Optional boolean. If True, simplify the layer as a coverage so that shared
+               boundaries stay identical. Default is False.
+
+    Returns
+    ----------
+    simplified_df : Geodataframe with the simplified outlines and the n_vert_in, n_vert_out and
+                    area_chg columns
+    '''
+
+    geoms = np.asarray(data.geometry.values)
+    area_in = shapely.area(geoms)
+
+    # Snap to the grid. Outlines smaller than a grid cell collapse to empty, so keep those as is.
+    snapped = shapely.set_precision(geoms, grid_size)
+    collapsed = shapely.is_empty(snapped)
+    snapped[collapsed] = geoms[collapsed]
+
+    if coverage:
+        if not hasattr(shapely, 'coverage_simplify'):
+            raise ValueError("coverage=True needs shapely 2.1 or later for coverage_simplify")
+
+        # Simplify the whole layer together, halving the tolerance until every outline is within
+        # max_area_error. Doing this per outline would break the shared boundaries again.
+        for i in range(max_tries):
+            simplified = shapely.coverage_simplify(snapped, tolerance / 2**i)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                area_error = np.abs(shapely.area(simplified) - area_in) / area_in
+            if np.all((area_error <= max_area_error) | (area_in == 0)):
+                break
+        else:
+            simplified = snapped.copy()
+    else:
+        # Simplify, halving the tolerance for the outlines that change area too much
+        simplified = snapped.copy()
+        todo = np.arange(len(geoms))
+        for i in range(max_tries):
+            simplified[todo] = shapely.simplify(snapped[todo], tolerance / 2**i, preserve_topology=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                area_error = np.abs(shapely.area(simplified[todo]) - area_in[todo]) / area_in[todo]
+            todo = todo[~(area_error <= max_area_error)]
+            if len(todo) == 0:
+                break
+        simplified[todo] = snapped[todo]
+
+    simplified_df = data.copy()
+    simplified_df['n_vert_in'] = shapely.get_num_coordinates(geoms)
+    simplified_df['n_vert_out'] = shapely.get_num_coordinates(simplified)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        simplified_df['area_chg'] = np.where(area_in > 0, (shapely.area(simplified) - area_in) / area_in, 0.0)
+    simplified_df = simplified_df.set_geometry(gpd.GeoSeries(simplified, index=data.index, crs=data.crs))
+
+    print("Vertices reduced from " + str(simplified_df['n_vert_in'].sum()) + " to "
+          + str(simplified_df['n_vert_out'].sum()) + ". Largest area change: "
+          + str(simplified_df['area_chg'].abs().max()))
+
+    return simplified_df
+
+
+def _simplified_region_path(region_no, source, grid_size=1e-6, tolerance=1e-4, max_area_error=0.01, coverage=False):
+    if source == 'GLIMS':
+        simplified_fp = "data/glims/processed/simplified/glims_region_" + str(region_no) + "_simplified"
+    elif source == 'RGI':
+        simplified_fp = "data/rgi/processed/simplified/rgi_region_" + str(region_no) + "_simplified"
+    else:
+        return None
+
+    # Dots are replaced so the settings don't look like a file extension
+    settings = "_g{:g}_t{:g}_e{:g}".format(grid_size, tolerance, max_area_error).replace(".", "p")
+    simplified_fp += settings
+    if coverage:
+        simplified_fp += "_coverage"
+
+    return simplified_fp + ".shp"
+
+
+def open_simplified_region(region_no, source, grid_size=1e-6, tolerance=1e-4, max_area_error=0.01,
+                           coverage=False):
+    '''
+    Opens the simplified outlines for a region. The first time a region is opened with a set of
+    simplification settings its validated outlines are simplified with simplify_outlines and
+    saved for the later stages to use. The settings are part of the file name (e.g.
+    glims_region_1_simplified_g1e-06_t0p0001_e0p01.shp), so outlines simplified with other
+    settings are never returned. Outlines simplified as a coverage also get a _coverage suffix.
+
+    Parameters
+    ----------
+    region_no : Integer with the region number. Accepted values are 1 through 19 for GLIMS and
+                1 through 20 for RGI. Note that to open the region 5 cleaned shapefile, need set
+                region_no to 20.
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS or RGI
+    grid_size, tolerance, max_area_error, coverage : Optional simplification settings. See simplify_outlines.
+
+    Returns
+    ----------
+    simplified_df : Geodataframe with the simplified outlines for the region
+    '''
+
+    simplified_fp = _simplified_region_path(region_no, source, grid_size, tolerance, max_area_error, coverage)
+    if simplified_fp is None:
+        print("Incorrect source input")
+        return
+
+    if os.path.exists(simplified_fp):
+        return gpd.read_file(simplified_fp)
+
+    validated_df = open_validated_region(region_no, source)
+
+    print("Creating file " + simplified_fp)
+    simplified_df = simplify_outlines(validated_df, grid_size=grid_size, tolerance=tolerance,
+                                      max_area_error=max_area_error, coverage=coverage)
+    with atomic_output(simplified_fp) as tmp_fp:
+        simplified_df.to_file(driver='ESRI Shapefile', filename=tmp_fp)
+
+    return simplified_df
@@ -0,0 +1,240 @@
+"""
+WGMS Project Module - Loaders
+Author: Ann Windnagel
+Date: 3/3/2019
+
+This module contains the functions that open the regional GLIMS and RGI shapefiles.
+* open_rgi_region: Opens RGI data file for a particular region
+* open_clean_glims: Opens a cleaned GLIMS data file for a particular region
+* multi_temporal_glims: Finds all the dates that the largest 3 glaciers have measurements 
+  for each of the 19 regions from GLIMS.
+* find_glacier_all_glims: Extract the data rows for a particular glacier from the full GLIMS database, 
+  which contains all temporal measurements.
+* find_glacier_clean_glims: Extract the data rows for a particular glacier from the cleaned 
+  GLIMS database, which contains only the latest measurements. 
+* load_regions: Reads several regional files concurrently and yields each one as soon as it is read
+
+"""
+
+import geopandas as gpd
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from .fileio import RGI_REGION_FILE_NAMES, region_file_path
+from .reporting import print_10_largest_glims
+
+
+def open_rgi_region(region_no):
+    '''
+    Opens RGI shapefile for one of 19 glacial regions
+    Note - To open the region 5 cleaned shapefile, need set region_no to 20
+
+    Parameters
+    ----------
+    region_no : The region number as an integer. Accepted values are 1 through 20.
+                Note - To open the region 5 cleaned shapefile, need set region_no to 20
+
+    Returns
+    ----------
+    rgi_region_df: Returns a geopandas dataframe of the shapefile for given region.
+    '''
+
+    # root data directory
+    root_data_dir = "data/rgi/raw/"
+
+    if region_no >= 1 and region_no <=20:        
+        # Open file 
+        #print(RGI_REGION_FILE_NAMES[region_no-1])
+        rgi_region_df = gpd.read_file(root_data_dir + RGI_REGION_FILE_NAMES[region_no-1])
+    else:
+        rgi_region_df = "-999"
+        print("Specified region does not exist.")
+    
+    return rgi_region_df
+
+
+def open_clean_glims(region_no):
+    '''
+    Opens cleaned GLIMS shapefile for one of 19 glacial regions
+
+    Parameters
+    ----------
+    region_no : The region number as an integer. Accepted values are 1 through 19.
+
+    Returns
+    ----------
+    glims_region_df: Returns a geopandas dataframe of the shapefile for given region.
+    '''
+    
+    if region_no >= 1 and region_no <=19:        
+        
+        # Open file
+        glims_fp = "data/glims/processed/cleaned/glims_region_" + str(region_no) + "_cleaned.shp" 
+        glims_region_df = gpd.read_file(glims_fp)
+        
+    else:
+        glims_region_df = "-999"
+        print("Specified region does not exist.")
+    
+    return glims_region_df
+
+
+def multi_temporal_glims(region_no, do_print=None):
+    """
+    Finds all the dates that the largest 3 glaciers have measurements for each of the 19 regions from GLIMS.
+
+    Parameters
+    ----------
+    region_no : The region number as an integer. Accepted values are 1 through 19.
+    do_print : String, if set to "false", will not print. Default is to print.
+
+    Returns
+    -------
+    glims_multi_temporal_largest : A pandas dataframe with a list of the 3 largest glaciers for the specified region
+                                 along with all the different dates that they have measurements.
+    """
+    
+    # Open GLIMS region shapefile
+    glims_region_fp = "data/glims/processed/glims_region_" + str(region_no) + ".shp"
+    glims_polygons = gpd.read_file(glims_region_fp)
+
+    # Open and print GLIMS Region csv file with 10 largest glaciers
+    glims_largest = print_10_largest_glims(region_no, do_print="false")
+    
+    # Find all the instances for when the top 3 largest glaciers occur
+    largest_1 = glims_polygons[(glims_polygons['glac_id'] == glims_largest.glac_id[0]) &
+                (glims_polygons['line_type'] == "glac_bound")]
+
+    largest_2 = glims_polygons[(glims_polygons['glac_id'] == glims_largest.glac_id[1]) &
+                (glims_polygons['line_type'] == "glac_bound")]
+
+
+    largest_3 = glims_polygons[(glims_polygons['glac_id'] == glims_largest.glac_id[2]) &
+                (glims_polygons['line_type'] == "glac_bound")]
+
+    # Concantenate them all together
+    glims_multi_temporal_largest = pd.concat([largest_1, largest_2, largest_3])
+                              
+    if do_print != "false":
+        print(largest_1[['glac_name', 'glac_id', 'src_date', 'db_area']])
+        print('')
+        
+        print(largest_2[['glac_name', 'glac_id', 'src_date', 'db_area']])
+        print('')
+        
+        print(largest_3[['glac_name', 'glac_id', 'src_date', 'db_area']])
+        print('')
+    
+    return glims_multi_temporal_largest
+
+
+def find_glacier_all_glims(glims_id, region_no):
+    """
+    Extract the data rows for a particular glacier from the full GLIMS database, which contains all temporal
+    measurements.
+
+    Parameters
+    ----------
+    glims_id : String containing the GLIMS glacier id.
+    region_no : The region number as an integer. Accepted values are 1 through 19. This number is required 
+                to open the correct data file.
+
+    Returns
+    -------
+    glims_data : A pandas dataframe with a the rows of data associated with the given glims id.
+    """
+    
+    # Open the regional GLIMS file
+    glims_glacier_data_fp = "data/glims/processed/glims_region_" + str(region_no) + ".shp"
+    glims_glacier_data = gpd.read_file(glims_glacier_data_fp)
+    
+    # Find the glacier based on the GLIMS Id
+    glims_glacier = glims_glacier_data[glims_glacier_data['glac_id']==glims_id]
+    
+    return glims_glacier
+
+
+def find_glacier_clean_glims(glims_id, region_no):
+    """
+    Extract the data rows for a particular glacier from the cleaned GLIMS database, which contains only the latest
+    measurements.
+
+    Parameters
+    ----------
+    glims_id : String containing the GLIMS glacier id.
+    region_no : The region number as an integer. Accepted values are 1 through 19. This number is required 
+                to open the correct data file.
+
+    Returns
+    -------
+    glims_data : A pandas dataframe with a the rows of data associated with the given glims id.
+    """
+    
+    # Open the regional GLIMS file
+    glims_glacier_data_fp = "data/glims/processed/cleaned/glims_region_" + str(region_no) + "_cleaned.shp"
+    glims_glacier_data = gpd.read_file(glims_glacier_data_fp)
+    
+    # Find the glacier based on the GLIMS Id
+    glims_glacier = glims_glacier_data[glims_glacier_data['glac_id']==glims_id]
+    
+    return glims_glacier
+
+
+def _read_region(region_no, source, columns):
+    '''
+    Reads one regional file for load_regions. This is a module level function so that it can be
+    sent to a process pool.
+    '''
+
+    fp = region_file_path(region_no, source)
+    if columns is None:
+        return gpd.read_file(fp)
+
+    return gpd.read_file(fp, columns=columns)
+
+
+def load_regions(regions, source, columns=None, max_workers=4, use_processes=False):
+    '''
+    Reads the shapefiles for several regions concurrently and yields each region as soon as it has
+    been read, so that the processing of one region overlaps with the reading of the next ones.
+    At most max_workers regions are read ahead of the one being processed, which bounds the memory
+    used by regions that have been read but not yet processed.
+
+    Parameters
+    ----------
+    regions : List of integer region numbers
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS, GLIMS_ALL
+              or RGI. See region_file_path.
+    columns : Optional list of the attribute columns to read. Default is all columns.
+    max_workers : Optional integer with the number of files read at the same time. Default is 4.
+    use_processes : Optional boolean. Reading is mostly waiting on the disk, so threads are used by
+                    default. Set to True to decode the files in separate processes instead.
+
+    Yields
+    ----------
+    (region_no, data) : The region number and a geodataframe of its outlines, in the order the
+                        regions finish reading (not the order of regions)
+
+    Example
+    ----------
+    for region_no, glims_polygons in ws.load_regions(range(1, 20), 'GLIMS'):
+        ws.ten_largest(glims_polygons, region_no, 'GLIMS')
+    '''
+
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    regions = list(regions)
+
+    with pool_class(max_workers=max_workers) as pool:
+        pending = {}
+        next_region = 0
+        while next_region < len(regions) or pending:
+            # Keep max_workers files reading
+            while next_region < len(regions) and len(pending) < max_workers:
+                region_no = regions[next_region]
+                pending[pool.submit(_read_region, region_no, source, columns)] = region_no
+                next_region += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                region_no = pending.pop(future)
+                yield region_no, future.result()
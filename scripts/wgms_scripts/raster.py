@@ -0,0 +1,53 @@
+"""
+WGMS Project Module - Raster
+Author: Ann Windnagel
+Date: 3/3/2019
+
+This module contains the raster functions.
+* reproject_raster: Reprojects a raster .tif file from one crs to another
+
+"""
+
+import rasterio as rio
+from rasterio.warp import calculate_default_transform, reproject, Resampling
+
+
+def reproject_raster(inpath, outpath, new_crs):
+    '''
+    This funiton reprojects a raster .tif file from one crs to another.
+
+    Parameters
+    ----------
+    inpath : String containing the path and filename to the input raster .tif file
+    outpath : String containing the path and filename to the output raster .tif file
+    new_crs :  String with the new crs to be reprojected to. Ex: 'EPSG:3049'
+
+    Returns
+    ----------
+    nothing: Saves a new .tif file in the new crs
+    '''    
+    dst_crs = new_crs
+
+    with rio.open(inpath) as src:
+        transform, width, height = calculate_default_transform(
+            src.crs, new_crs, src.width, src.height, *src.bounds)
+        kwargs = src.meta.copy()
+        kwargs.update({
+            'crs': new_crs,
+            'transform': transform,
+            'width': width,
+            'height': height
+        })
+
+        with rio.open(outpath, 'w', **kwargs) as dst:
+            for i in range(1, src.count + 1):
+                reproject(
+                    source=rio.band(src, i),
+                    destination=rio.band(dst, i),
+                    src_transform=src.transform,
+                    src_crs=src.crs,
+                    dst_transform=transform,
+                    dst_crs=new_crs,
+                    resampling=Resampling.nearest)
+     
+    return
@@ -0,0 +1,213 @@
+"""
+WGMS Project Module - Reporting
+Author: Ann Windnagel
+Date: 3/3/2019
+
+This module contains the functions that find, print and save the largest glaciers in a region.
+It only needs pandas so that it is quick to import.
+* print_10_largest_glims: Prints the ten largest glaciers for a particular region for GLIMS
+* print_10_largest_rgi: Prints the ten largest glaciers for a particular region for RGI
+* ten_largest: Finds the 10 largest glaciers in a region and saves them to a csv file
+* save_5_largest: Saves the 5 largest glacier outlines in a region to a shapefile
+* ten_largest_icecaps: Finds the 10 largest ice caps in a region and saves them to a csv file
+
+"""
+
+import os
+import pandas as pd
+
+
+def print_10_largest_glims(region_no, do_print=None):
+    """
+    Opens and prints the list of 10 largest glaciers for a specified region for GLIMS and
+    returns the data as a pandas dataframe.
+
+    Parameters
+    ----------
+    region_no : The region number as an integer. Accepted values are 1 through 19.
+    do_print : String, if set to "false", will not print. Default is to print.
+
+    Returns
+    -------
+    glims_largest : A pandas dataframe with a list of the 10 largest glaciers for the specified region
+    """
+    
+    # Check do_print. If not set, set to true
+    do_print = do_print or "true"
+    
+    # Create a list with all the region names
+    region_names = ["Alaska", "Western Canada and USA",
+                    "Arctic Canada, North", "Arctic Canada, South",
+                    "Greenland Periphery", "Iceland", "Svalbard and Jan Mayen",
+                    "Scandinavia", "Russian Arctic", "Asia, North", "Central Europe",
+                    "Caucasus and Middle East", "Asia, Central", "Asia, South West",
+                    "Asia, South East", "Low Latitudes", "Southern Andes", "New Zealand", 
+                    "Antarctic and Subantarctic"]
+    
+    # Open GLIMS csv file for specified region with 10 largest glaciers
+    glims_largest_fp = "data/glims/processed/largest/glims_region_" + str(region_no) + "_largest.csv"
+    glims_largest = pd.read_csv(glims_largest_fp)
+    if do_print != "false":
+        print('GLIMS 10 Largest glaciers and their size for Region ' + str(region_no) + ' - ' + region_names[region_no-1] + ':')
+        print('')
+        print('      Glacier ID               Area (km^2)      Glacier Name       Date of Measurement')
+        print(glims_largest.to_string(header=False, index=False, col_space=20))
+    
+    return glims_largest
+
+
+def print_10_largest_rgi(region_no, do_print=None):
+    """
+    Opens and prints the list of 10 largest glaciers for a specified region for RGI and
+    returns the data as a pandas dataframe.
+
+    Parameters
+    ----------
+    region_no : The region number as an integer. Accepted values are 1 through 19.
+    do_print : String, if set to "false", will not print. Default is to print.
+
+    Returns
+    -------
+    rgi_largest : A pandas dataframe with a list of the 10 largest glaciers for the specified region
+    """
+
+    # Check do_print. If not set, set to true
+    do_print = do_print or "true"
+    
+    # Create a list with all the region names
+    region_names = ["Alaska", "Western Canada and USA",
+                    "Arctic Canada, North", "Arctic Canada, South",
+                    "Greenland Periphery", "Iceland", "Svalbard and Jan Mayen",
+                    "Scandinavia", "Russian Arctic", "Asia, North", "Central Europe",
+                    "Caucasus and Middle East", "Asia, Central", "Asia, South West",
+                    "Asia, South East", "Low Latitudes", "Southern Andes", "New Zealand", 
+                    "Antarctic and Subantarctic"]
+    
+    # Open RGI csv file for specified region with 10 largest glaciers
+    rgi_largest_fp = "data/rgi/processed/largest/rgi_region_" + str(region_no) + "_largest.csv"
+    rgi_largest = pd.read_csv(rgi_largest_fp)
+    
+    if do_print != "false":
+        print('RGI 10 Largest glaciers and their size for Region ' + str(region_no) + ' - ' + region_names[region_no-1] + ':')
+        print('')
+        print('      Glacier ID               Area (km^2)      Glacier Name       Date of Measurement')
+        print(rgi_largest.to_string(header=False, index=False, col_space=20))
+    
+    return rgi_largest
+
+
+def ten_largest(data, region_no, source):
+    '''
+    Finds the 10 largest glaciers in a region and saves them to a csv file
+
+    Parameters
+    ----------
+    data : Geodataframe containing all glacier polygons for a region
+    region_no : Integer with the region number. Accepted values are 1 through 19.
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS or RGI
+
+    Returns
+    ----------
+    nothing: Saves a csv file of the 10 largest glaciers for a region
+    '''
+    
+    if source == 'GLIMS':
+        # Find 10 largest
+        ten_largest_df = data[['glac_id', 'db_area', 'glac_name', 'src_date']].nlargest(10, 'db_area')
+        
+        # Save to csv file if it doesn't already exist
+        glims_largest_csv_fp = "data/glims/processed/largest/glims_region_" + str(region_no) + "_largest.csv"
+        if os.path.exists(glims_largest_csv_fp) == False:
+            print(region_no)
+            ten_largest_df.to_csv(glims_largest_csv_fp, index=False)
+        else:
+            print("GLIMS Region " + str(region_no) + " largest 10 CSV file already exists")
+        
+    elif source == 'RGI':
+        # Find 10 largest
+        ten_largest_df = data[['GLIMSId', 'Area', 'Name', 'BgnDate']].nlargest(10, 'Area')
+        
+        # Save to csv file if it doesn't already exist
+        rgi_largest_csv_fp = "data/rgi/processed/largest/rgi_region_" + str(region_no) + "_largest.csv"
+        if os.path.exists(rgi_largest_csv_fp) == False:
+            print(region_no)
+            ten_largest_df.to_csv(rgi_largest_csv_fp, index=False)
+        else:
+            print("RGI Region " + str(region_no) + " largest 10 CSV file already exists")
+        
+    else:
+        print("Incorrect source input")
+    
+    return
+
+
+def save_5_largest(largest_1_df, largest_2_df, largest_3_df, largest_4_df, largest_5_df, region_no, source):
+    '''
+    Saves the 5 largest glacier outlines in a region to a shapefile
+
+    Parameters
+    ----------
+    largest_1_df : Geodataframe containing the first largest glacier polygon for a region
+    largest_2_df : Geodataframe containing the second largest glacier polygon for a region
+    largest_3_df : Geodataframe containing the third largest glacier polygon for a region
+    largest_4_df : Geodataframe containing the fourth largest glacier polygon for a region
+    largest_5_df : Geodataframe containing the fifth largest glacier polygon for a region
+    region_no : Integer with the region number. Accepted values are 1 through 19
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS or RGI
+
+    Returns
+    ----------
+    nothing: Saves a shapefile 5 largest GLIMS glaciers for a region
+    '''    
+    
+    # Set file path based on source selected
+    if source == 'GLIMS':
+        largest_5_fp = "data/glims/processed/largest/glims_region_" + str(region_no) + "_largest.shp"
+    elif source == 'RGI':
+        largest_5_fp = "data/rgi/processed/largest/rgi_region_" + str(region_no) + "_largest.shp"
+    else:
+        print("Incorrect source input")
+        return
+    
+    # Check if the file already exists; if it does not, save file.
+    if os.path.exists(largest_5_fp) == False:
+        print("Creating file " + largest_5_fp)
+        # Append the 5 biggest into one dataframe
+        largest_5 = largest_1_df.append([largest_2_df, largest_3_df, largest_4_df, largest_5_df], ignore_index=True)
+
+        # Save 3 largest from specified region to shapefile
+        largest_5.to_file(driver='ESRI Shapefile', filename=largest_5_fp)
+        
+    else:
+        print(largest_5_fp + " file already exists")
+    
+    return
+
+
+def ten_largest_icecaps(data, region_no, source):
+    '''
+    Need to test if this function works - 11/22/19
+    Finds the 10 largest ice caps in a region and saves them to a csv file
+
+    Parameters
+    ----------
+    data : Geodataframe containing all glacier polygons for a region
+    region_no : Integer with the region number. Accepted values are 1 through 19.
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS or RGI
+
+    Returns
+    ----------
+    nothing: Saves a csv file of the 10 largest ice caps for a region
+    '''
+    
+    
+    # Find 10 largest
+    ten_largest_ic_df = data[['glac_id', 'db_area', 'glac_name', 'src_date']].nlargest(10, 'db_area')
+     
+    # Save to csv file if it doesn't already exist
+    glims_largest_csv_fp = "data/glims/processed/ice-caps/largest/glims_region_" + str(region_no) + "_largest.csv"
+    if os.path.exists(glims_largest_csv_fp) == False:
+        print(region_no)
+        ten_largest_df.to_csv(glims_largest_csv_fp, index=False)
+        
+    return
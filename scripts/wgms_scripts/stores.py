@@ -0,0 +1,402 @@
+"""
+WGMS Project Module - Stores
+Author: Ann Windnagel
+Date: 3/3/2019
+
+This module contains the array-backed and time-indexed stores of glacier outlines.
+* GeometryStore: Compact array-backed store of a region's outlines that can be memory-mapped from disk
+* open_geometry_store: Opens the geometry store for a region, creating it if needed
+* TemporalGlimsStore: Time-indexed store of all the dated GLIMS outlines in a region for change analysis
+* open_temporal_glims: Opens the time-indexed GLIMS store for a region, creating it if needed
+
+"""
+
+import geopandas as gpd
+import pandas as pd
+import numpy as np
+import os
+import shapely
+from shapely.geometry import Polygon, MultiPolygon
+
+from .fileio import atomic_output
+from .geometry import open_validated_region
+
+
+class GeometryStore:
+    '''
+    Compact array-backed store of the glacier outlines for a region. The outlines are kept as one
+    flat array of coordinates with offset arrays for the rings, polygon parts and glaciers
+    (the same layout as shapely.to_ragged_array), plus the bounding boxes and ids. This avoids
+    holding one shapely object and nested coordinate lists per glacier in memory.
+
+    Bounding box queries, areas and vertex counts are computed directly on the arrays. Shapely
+    geometries are only built, with geometries(), for the glaciers that need an exact test.
+    Stores are saved as a directory of .npy files and are memory-mapped when loaded.
+
+    Parameters
+    ----------
+    coords : Numpy array (n_coords, 2) with the x, y coordinates of all the rings
+    ring_offsets : Numpy array with the start of each ring in coords (length n_rings + 1)
+    part_offsets : Numpy array with the first ring of each polygon part (length n_parts + 1)
+    geom_offsets : Numpy array with the first part of each glacier (length n_glaciers + 1)
+    bounds : Numpy array (n_glaciers, 4) with xmin, ymin, xmax, ymax of each glacier
+    ids : Numpy array with the glacier id of each glacier
+    '''
+
+    ARRAYS = ['coords', 'ring_offsets', 'part_offsets', 'geom_offsets', 'bounds', 'ids']
+
+    def __init__(self, coords, ring_offsets, part_offsets, geom_offsets, bounds, ids):
+        self.coords = coords
+        self.ring_offsets = ring_offsets
+        self.part_offsets = part_offsets
+        self.geom_offsets = geom_offsets
+        self.bounds = bounds
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_geodataframe(cls, data, id_column):
+        '''
+        Creates a store from a geodataframe of polygons and multipolygons
+
+        Parameters
+        ----------
+        data : Geodataframe containing glacier polygons
+        id_column : String with the name of the glacier id column (glac_id for GLIMS, RGIId for RGI)
+
+        Returns
+        ----------
+        store : GeometryStore with the outlines of data
+        '''
+
+        geoms = np.asarray(data.geometry.values)
+        geom_type, coords, offsets = shapely.to_ragged_array(geoms)
+        if geom_type == shapely.GeometryType.POLYGON:
+            # Every glacier has exactly one polygon part
+            ring_offsets, part_offsets = offsets
+            geom_offsets = np.arange(len(geoms) + 1)
+        else:
+            ring_offsets, part_offsets, geom_offsets = offsets
+
+        return cls(coords, ring_offsets, part_offsets, geom_offsets, shapely.bounds(geoms),
+                   data[id_column].to_numpy(dtype=str))
+
+    def save(self, store_dir):
+        '''
+        Saves the store as a directory of .npy files
+        '''
+
+        os.makedirs(store_dir, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(store_dir, name + ".npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, store_dir, mmap=True):
+        '''
+        Loads a store saved with save. By default the arrays are memory-mapped so only the parts
+        that are used are read from disk.
+        '''
+
+        mmap_mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(store_dir, name + ".npy"), mmap_mode=mmap_mode) for name in cls.ARRAYS]
+
+        return cls(*arrays)
+
+    def bbox_query(self, xmin, ymin, xmax, ymax):
+        '''
+        Returns the positions of the glaciers whose bounding boxes intersect the given box
+        '''
+
+        b = self.bounds
+        hits = (b[:, 0] <= xmax) & (b[:, 2] >= xmin) & (b[:, 1] <= ymax) & (b[:, 3] >= ymin)
+
+        return np.flatnonzero(hits)
+
+    def vertex_counts(self):
+        '''
+        Returns the number of vertices of each glacier
+        '''
+
+        ring_ends = self.ring_offsets[self.part_offsets[self.geom_offsets]]
+
+        return np.diff(ring_ends)
+
+    def areas(self):
+        '''
+        Returns the planar area of each glacier in the units of the coordinates (same as shapely's
+        area). Ring areas come from the shoelace formula; the first ring of each part is the
+        exterior and the other rings are holes.
+        '''
+
+        x = self.coords[:, 0]
+        y = self.coords[:, 1]
+        # Cross products of consecutive vertices. Rings are closed, so the product that spans two
+        # rings is dropped by summing only within each ring.
+        cross = np.zeros(len(x))
+        cross[:-1] = x[:-1] * y[1:] - x[1:] * y[:-1]
+        starts = self.ring_offsets[:-1]
+        ends = self.ring_offsets[1:]
+        cum = np.concatenate([[0.0], np.cumsum(cross)])
+        ring_areas = np.abs(cum[ends - 1] - cum[starts]) / 2
+
+        # Empty parts have no rings, so only the parts that have one mark an exterior
+        part_starts = self.part_offsets[:-1]
+        has_rings = self.part_offsets[1:] > part_starts
+        is_exterior = np.zeros(len(ring_areas), dtype=bool)
+        is_exterior[part_starts[has_rings]] = True
+        signed = np.where(is_exterior, ring_areas, -ring_areas)
+
+        ring_cum = np.concatenate([[0.0], np.cumsum(signed)])
+        geom_ring_offsets = self.part_offsets[self.geom_offsets]
+
+        return ring_cum[geom_ring_offsets[1:]] - ring_cum[geom_ring_offsets[:-1]]
+
+    def geometries(self, positions=None):
+        '''
+        Builds shapely geometries for the glaciers at the given positions (all glaciers if None).
+        Use this only for the glaciers that need an exact geometry test. Empty parts are left out,
+        so a glacier with an empty (or missing) outline gives an empty MultiPolygon.
+
+        Returns
+        ----------
+        geoms : Numpy array of shapely MultiPolygons
+        '''
+
+        if positions is None:
+            positions = np.arange(len(self))
+
+        geoms = np.empty(len(positions), dtype=object)
+        for i, pos in enumerate(positions):
+            parts = []
+            for part in range(self.geom_offsets[pos], self.geom_offsets[pos + 1]):
+                rings = [np.asarray(self.coords[self.ring_offsets[r]:self.ring_offsets[r + 1]])
+                         for r in range(self.part_offsets[part], self.part_offsets[part + 1])]
+                if rings:
+                    parts.append(Polygon(rings[0], rings[1:]))
+            geoms[i] = MultiPolygon(parts)
+
+        return geoms
+
+
+def open_geometry_store(region_no, source, mmap=True):
+    '''
+    Opens the geometry store for a region. The first time a region is opened the store is created
+    from the validated outlines and saved, after that it is memory-mapped from disk.
+
+    Parameters
+    ----------
+    region_no : Integer with the region number. Accepted values are 1 through 19 for GLIMS and
+                1 through 20 for RGI. Note that to open the region 5 cleaned shapefile, need set
+                region_no to 20.
+    source :  String with the source of the glacier outlines. Accepted values are GLIMS or RGI
+    mmap : Optional boolean. If True (default) the arrays are memory-mapped.
+
+    Returns
+    ----------
+    store : GeometryStore for the region
+    '''
+
+    if source == 'GLIMS':
+        store_dir = "data/glims/processed/store/glims_region_" + str(region_no)
+        id_column = 'glac_id'
+    elif source == 'RGI':
+        store_dir = "data/rgi/processed/store/rgi_region_" + str(region_no)
+        id_column = 'RGIId'
+    else:
+        print("Incorrect source input")
+        return
+
+    if not os.path.exists(os.path.join(store_dir, "ids.npy")):
+        print("Creating store " + store_dir)
+        store = GeometryStore.from_geodataframe(open_validated_region(region_no, source), id_column)
+        store.save(store_dir)
+
+    return GeometryStore.load(store_dir, mmap=mmap)
+
+
+class TemporalGlimsStore:
+    '''
+    Time-indexed store of every dated glacier outline (line_type glac_bound) in a GLIMS region,
+    keyed by (glac_id, src_date) and sorted on that key so that range queries are index slices.
+    Only the attributes are held in memory. The outlines are kept as WKB and are only decoded
+    when geometries() is called.
+
+    When a glacier has more than one outline for the same date, the largest db_area is used for
+    that date.
+
+    Parameters
+    ----------
+    table : Pandas dataframe indexed by (glac_id, src_date) with columns glac_name, db_area and row
+            (the row of the outline in wkb)
+    wkb : Numpy array with the WKB of each outline
+    crs : The crs of the outlines (anything geopandas accepts as a crs, e.g. a WKT string)
+    '''
+
+    def __init__(self, table, wkb, crs):
+        self.table = table
+        self.wkb = wkb
+        self.crs = crs
+
+    @classmethod
+    def from_geodataframe(cls, glims_polygons):
+        '''
+        Creates a store from a raw regional GLIMS geodataframe (e.g. glims_region_1.shp)
+        '''
+
+        glac_bounds = glims_polygons[glims_polygons['line_type'] == 'glac_bound']
+        wkb = shapely.to_wkb(np.asarray(glac_bounds.geometry.values))
+
+        table = pd.DataFrame({'glac_id': glac_bounds['glac_id'].values,
+                              'src_date': pd.to_datetime(glac_bounds['src_date'].values, errors='coerce'),
+                              'glac_name': glac_bounds['glac_name'].values,
+                              'db_area': glac_bounds['db_area'].values,
+                              'row': np.arange(len(glac_bounds))})
+        table = table.dropna(subset=['src_date'])
+        table = table.sort_values(['glac_id', 'src_date', 'db_area'])
+        table = table.drop_duplicates(['glac_id', 'src_date'], keep='last')
+        table = table.set_index(['glac_id', 'src_date'])
+
+        return cls(table, wkb, glims_polygons.crs)
+
+    def save(self, fp):
+        '''
+        Saves the store to fp (the table), fp with a _wkb suffix (the outlines) and fp with a
+        _crs.txt suffix (the crs as WKT)
+        '''
+
+        # The table is written last because open_temporal_glims uses fp as the "done" marker
+        with atomic_output(fp.replace(".pkl", "_wkb.pkl")) as tmp_fp:
+            pd.Series(self.wkb).to_pickle(tmp_fp)
+        crs = gpd.GeoSeries([], crs=self.crs).crs
+        with atomic_output(fp.replace(".pkl", "_crs.txt")) as tmp_fp:
+            with open(tmp_fp, "w") as f:
+                f.write(crs.to_wkt() if crs is not None else "")
+        with atomic_output(fp) as tmp_fp:
+            self.table.to_pickle(tmp_fp)
+
+    @classmethod
+    def load(cls, fp):
+        '''
+        Loads a store saved with save
+        '''
+
+        table = pd.read_pickle(fp)
+        wkb = pd.read_pickle(fp.replace(".pkl", "_wkb.pkl")).values
+        with open(fp.replace(".pkl", "_crs.txt")) as f:
+            crs = f.read() or None
+
+        return cls(table, wkb, crs)
+
+    def query(self, glac_ids=None, start=None, end=None):
+        '''
+        Returns the rows for the given glaciers (all glaciers if None) with src_date between
+        start and end (inclusive, open ended if None)
+        '''
+
+        if glac_ids is None:
+            glac_ids = slice(None)
+
+        return self.table.loc[(glac_ids, slice(start, end)), :]
+
+    def date_counts(self):
+        '''
+        Returns a Series with the number of dates that each glacier has an outline for
+        '''
+
+        return self.table.groupby(level='glac_id').size()
+
+    def glaciers_with_dates(self, min_dates=2):
+        '''
+        Returns the ids of the glaciers that have outlines for at least min_dates dates
+        '''
+
+        counts = self.date_counts()
+
+        return counts.index[counts >= min_dates].values
+
+    def area_at(self, date):
+        '''
+        Returns a dataframe indexed by glac_id with the src_date and db_area of the latest outline
+        on or before date for each glacier that has one
+        '''
+
+        before = self.query(end=pd.Timestamp(date)).reset_index()
+        # The table is sorted by date within each glacier, so the last row is the latest date
+        latest = before.groupby('glac_id', sort=False).tail(1)
+
+        return latest.set_index('glac_id')[['src_date', 'db_area']]
+
+    def area_change(self, start_date=None, end_date=None):
+        '''
+        Computes the area change of every glacier between its latest outline on or before start_date
+        and its latest outline on or before end_date. Without a start_date the change is from each
+        glacier's first outline, and without an end_date it is to each glacier's last outline.
+        Glaciers with only one outline in the period are left out. No geometries are loaded.
+
+        Returns
+        ----------
+        change_df : A pandas dataframe indexed by glac_id with the start and end dates and areas,
+                    the area change (km^2), the percent change and the change per year
+        '''
+
+        grouped = self.table.reset_index().groupby('glac_id', sort=False)
+        if start_date is None:
+            first = grouped.head(1).set_index('glac_id')[['src_date', 'db_area']]
+        else:
+            first = self.area_at(start_date)
+        if end_date is None:
+            last = grouped.tail(1).set_index('glac_id')[['src_date', 'db_area']]
+        else:
+            last = self.area_at(end_date)
+
+        change_df = first.join(last, how='inner', lsuffix='_start', rsuffix='_end')
+        change_df = change_df[change_df['src_date_end'] > change_df['src_date_start']]
+        years = (change_df['src_date_end'] - change_df['src_date_start']).dt.days / 365.25
+        change_df['area_change'] = change_df['db_area_end'] - change_df['db_area_start']
+        change_df['area_change_pct'] = 100 * change_df['area_change'] / change_df['db_area_start']
+        change_df['area_change_per_year'] = change_df['area_change'] / years
+
+        return change_df
+
+    def geometries(self, rows):
+        '''
+        Returns a geodataframe with the outlines for the given rows of the table (e.g. from query)
+        '''
+
+        geoms = shapely.from_wkb(self.wkb[rows['row'].values])
+
+        return gpd.GeoDataFrame(rows.reset_index(), geometry=geoms, crs=self.crs)
+
+
+def open_temporal_glims(region_no):
+    '''
+    Opens the time-indexed GLIMS store for a region. The first time a region is opened the store is
+    created from the raw regional GLIMS shapefile and saved.
+
+    Parameters
+    ----------
+    region_no : The region number as an integer. Accepted values are 1 through 19.
+
+    Returns
+    ----------
+    store : TemporalGlimsStore for the region
+
+    Example
+    ----------
+    store = open_temporal_glims(1)
+    multi_date_ids = store.glaciers_with_dates(2)
+    areas_2000 = store.area_at('2000-01-01')
+    '''
+
+    store_fp = "data/glims/processed/temporal/glims_region_" + str(region_no) + "_temporal.pkl"
+    if os.path.exists(store_fp):
+        return TemporalGlimsStore.load(store_fp)
+
+    print("Creating file " + store_fp)
+    glims_region_fp = "data/glims/processed/glims_region_" + str(region_no) + ".shp"
+    store = TemporalGlimsStore.from_geodataframe(gpd.read_file(glims_region_fp))
+    store.save(store_fp)
+
+    return store
@@ -0,0 +1,34 @@
+"""
+Checks for wgms_scripts.dissolve_polygons on a small synthetic shapefile
+"""
+
+import os
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+shapely = pytest.importorskip("shapely")
+pytest.importorskip("fiona")
+
+from shapely.geometry import Polygon, box
+
+from scripts.wgms_scripts.geometry import dissolve_polygons
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5000])
+def test_touching_polygons_are_merged(tmp_path, chunk_size):
+    # The bowtie is invalid and is repaired with buffer(0), which keeps one of its two triangles
+    bowtie = Polygon([(10, 0), (11, 1), (11, 0), (10, 1), (10, 0)])
+    polys = gpd.GeoDataFrame({'glac_id': ['A', 'B', 'C', 'D']},
+                             geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), box(5, 5, 6, 6), bowtie],
+                             crs='epsg:4326')
+    filename = str(tmp_path / "polys.shp")
+    polys.to_file(filename)
+    output_fn = str(tmp_path / "exploded.shp")
+
+    dissolve_polygons(filename, output_fn, chunk_size=chunk_size)
+
+    exploded = gpd.read_file(output_fn)
+    assert sorted(shapely.area(exploded.geometry.values).round(6)) == [0.25, 1.0, 2.0]
+    assert not os.path.exists(output_fn + ".checkpoint")
+    assert not [f for f in os.listdir(tmp_path) if "_partial" in f]
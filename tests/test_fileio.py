@@ -0,0 +1,61 @@
+"""
+Checks for the file utilities in wgms_scripts.fileio
+"""
+
+import os
+
+import pytest
+
+from scripts.wgms_scripts.fileio import atomic_output, load_checkpoint, region_file_path, save_checkpoint
+
+
+def test_atomic_output_only_renames_when_complete(tmp_path):
+    fp = str(tmp_path / "out.csv")
+    with pytest.raises(RuntimeError):
+        with atomic_output(fp) as tmp_fp:
+            with open(tmp_fp, "w") as f:
+                f.write("half")
+            raise RuntimeError
+    assert os.listdir(tmp_path) == []
+
+    with atomic_output(fp) as tmp_fp:
+        with open(tmp_fp, "w") as f:
+            f.write("done")
+    assert os.listdir(tmp_path) == ["out.csv"]
+
+
+def test_checkpoint_is_discarded_when_the_input_changes(tmp_path):
+    input_fp = str(tmp_path / "in.shp")
+    other_fp = str(tmp_path / "other.shp")
+    for path in [input_fp, other_fp]:
+        with open(path, "w") as f:
+            f.write("v1")
+    fp = str(tmp_path / "out.shp")
+
+    save_checkpoint(fp, {'next_feature': 10}, input_fp)
+    assert load_checkpoint(fp, input_fp) == {'next_feature': 10}
+    assert load_checkpoint(fp, other_fp) is None
+    assert not os.path.exists(fp + ".checkpoint")
+
+    save_checkpoint(fp, {'next_feature': 10}, input_fp)
+    os.utime(input_fp, (0, 0))
+    assert load_checkpoint(fp, input_fp) is None
+
+
+def test_checkpoint_without_input(tmp_path):
+    fp = str(tmp_path / "out.shp")
+    assert load_checkpoint(fp) is None
+    save_checkpoint(fp, [1, 2])
+    assert load_checkpoint(fp) == [1, 2]
+
+
+@pytest.mark.parametrize('region_no, source', [(0, 'GLIMS'), (20, 'GLIMS'), (20, 'GLIMS_ALL'), (0, 'RGI'), (21, 'RGI')])
+def test_region_file_path_rejects_out_of_range_regions(region_no, source):
+    with pytest.raises(ValueError):
+        region_file_path(region_no, source)
+
+
+def test_region_file_path():
+    assert region_file_path(19, 'GLIMS') == "data/glims/processed/cleaned/glims_region_19_cleaned.shp"
+    assert region_file_path(1, 'RGI') == "data/rgi/raw/01_rgi60_Alaska/01_rgi60_Alaska.shp"
+    assert region_file_path(20, 'RGI').endswith("05_rgi60_GreenlandPeriphery_clean.shp")
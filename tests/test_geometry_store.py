@@ -0,0 +1,47 @@
+"""
+Checks for wgms_scripts.GeometryStore against shapely on a few synthetic outlines
+"""
+
+import numpy as np
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+shapely = pytest.importorskip("shapely")
+
+from shapely.geometry import MultiPolygon, Polygon, box
+
+from scripts.wgms_scripts.stores import GeometryStore
+
+
+def make_store(geoms):
+    data = gpd.GeoDataFrame({'glac_id': ['G' + str(i) for i in range(len(geoms))]}, geometry=geoms)
+    return GeometryStore.from_geodataframe(data, 'glac_id')
+
+
+@pytest.mark.parametrize('geoms', [
+    [box(0, 0, 2, 2), Polygon(box(0, 0, 4, 4).exterior, [box(1, 1, 2, 2).exterior]), Polygon()],
+    [Polygon(), box(0, 0, 2, 2)],
+    [MultiPolygon([box(0, 0, 1, 1), box(2, 2, 4, 4)]), MultiPolygon(), box(0, 0, 3, 3)],
+    [box(0, 0, 1, 1), None],
+])
+def test_areas_and_geometries_match_shapely(geoms):
+    store = make_store(geoms)
+    expected = shapely.area(np.asarray(gpd.GeoSeries(geoms).values))
+    expected = np.nan_to_num(expected)
+
+    np.testing.assert_allclose(store.areas(), expected)
+
+    rebuilt = store.geometries()
+    np.testing.assert_allclose(shapely.area(rebuilt), expected)
+    for geom, original in zip(rebuilt, geoms):
+        assert geom.is_empty == (original is None or original.is_empty)
+
+
+def test_save_and_load_with_mmap(tmp_path):
+    store = make_store([box(0, 0, 1, 1), box(5, 5, 7, 7)])
+    store.save(str(tmp_path / "store"))
+    loaded = GeometryStore.load(str(tmp_path / "store"))
+
+    assert list(loaded.ids) == ['G0', 'G1']
+    assert list(loaded.bbox_query(4, 4, 6, 6)) == [1]
+    np.testing.assert_allclose(loaded.areas(), [1, 4])
@@ -0,0 +1,38 @@
+"""
+Regression checks for wgms_scripts.RegionLookup on a small synthetic regions layer
+"""
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+shapely = pytest.importorskip("shapely")
+
+from shapely.geometry import Point, Polygon, box
+
+from scripts.wgms_scripts.geometry import RegionLookup
+
+
+@pytest.fixture
+def lookup(tmp_path):
+    # Region 19 covers the bottom-left grid cell, which is where NaN coordinates used to end up
+    regions = gpd.GeoDataFrame({'RGI_CODE': [1, 19]},
+                               geometry=[box(10, 40, 20, 50), box(-180, -90, 180, -60)],
+                               crs='epsg:4326')
+    regions_fp = str(tmp_path / "regions.shp")
+    regions.to_file(regions_fp)
+    return RegionLookup(regions_fp=regions_fp, cell_size=1.0)
+
+
+def test_region_of_matches_exact_within(lookup):
+    geoms = [Point(15, 45), Point(0, 0), Point(0, -80), box(12, 42, 13, 43), box(12.5, 42.5, 12.6, 42.6),
+             box(19.5, 45, 20.5, 46)]
+    assert list(lookup.region_of(geoms)) == [1, 0, 19, 1, 1, 0]
+
+
+def test_empty_and_missing_geometries_are_outside(lookup):
+    geoms = [Polygon(), None, Point(), box(12, 42, 13, 43)]
+    assert list(lookup.region_of(geoms)) == [0, 0, 0, 1]
+
+
+def test_nan_coordinates_are_outside(lookup):
+    assert list(lookup.region_of_xy([float('nan'), 15.0], [float('nan'), 45.0])) == [0, 1]
@@ -0,0 +1,42 @@
+"""
+Checks for the simplified outlines used by wgms_scripts.explode_glaciers
+"""
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+shapely = pytest.importorskip("shapely")
+
+from shapely.geometry import Polygon
+
+from scripts.wgms_scripts.geometry import _simplified_region_path, explode_glaciers, simplify_outlines
+
+
+def test_simplified_path_depends_on_settings():
+    default_fp = _simplified_region_path(1, 'GLIMS')
+    assert default_fp == "data/glims/processed/simplified/glims_region_1_simplified_g1e-06_t0p0001_e0p01.shp"
+    assert _simplified_region_path(1, 'GLIMS', tolerance=1e-3) != default_fp
+    assert _simplified_region_path(1, 'GLIMS', coverage=True).endswith("_coverage.shp")
+    assert _simplified_region_path(1, 'WGI') is None
+
+
+def test_explode_simplified_huber_raises():
+    with pytest.raises(ValueError):
+        explode_glaciers(19, 'GLIMS', use_simplified=True)
+
+
+@pytest.mark.skipif(not hasattr(shapely, 'coverage_simplify'), reason="needs shapely 2.1 or later")
+def test_coverage_simplify_leaves_no_slivers():
+    # Two glaciers sharing a wiggly divide along x = 1
+    divide = [(1, i / 10) for i in range(11)]
+    divide = [(x + (0.00005 if i % 2 else 0), y) for i, (x, y) in enumerate(divide)]
+    left = Polygon([(0, 0)] + divide + [(0, 1)])
+    right = Polygon([(2, 0), (2, 1)] + divide[::-1])
+    data = gpd.GeoDataFrame({'glac_id': ['A', 'B']}, geometry=[left, right], crs='epsg:4326')
+
+    simplified = simplify_outlines(data, tolerance=0.01, coverage=True)
+
+    assert (simplified['n_vert_out'] < simplified['n_vert_in']).all()
+    merged = shapely.union_all(simplified.geometry.values)
+    assert merged.geom_type == 'Polygon'
+    assert len(merged.interiors) == 0
@@ -0,0 +1,50 @@
+"""
+Checks for wgms_scripts.TemporalGlimsStore on a few synthetic GLIMS outlines
+"""
+
+import os
+
+import pytest
+
+gpd = pytest.importorskip("geopandas")
+pytest.importorskip("shapely")
+
+from shapely.geometry import box
+
+from scripts.wgms_scripts.stores import TemporalGlimsStore
+
+
+@pytest.fixture
+def store():
+    glims = gpd.GeoDataFrame({'glac_id': ['G1', 'G1', 'G1', 'G2', 'G2'],
+                              'src_date': ['2000-01-01', '2005-01-01', '2010-01-01', '2001-01-01', '2011-01-01'],
+                              'glac_name': ['a', 'a', 'a', 'b', 'b'],
+                              'db_area': [10.0, 9.0, 8.0, 5.0, 4.0],
+                              'line_type': ['glac_bound'] * 5},
+                             geometry=[box(0, 0, 1, 1)] * 5, crs='epsg:4326')
+    return TemporalGlimsStore.from_geodataframe(glims)
+
+
+def test_area_change_end_date_without_start_date(store):
+    change_df = store.area_change(end_date='2006-01-01')
+    assert list(change_df.index) == ['G1']
+    assert change_df.loc['G1', 'db_area_start'] == 10.0
+    assert change_df.loc['G1', 'db_area_end'] == 9.0
+
+
+def test_area_change_start_date_without_end_date(store):
+    change_df = store.area_change(start_date='2002-01-01')
+    assert change_df.loc['G1', 'db_area_start'] == 10.0
+    assert change_df.loc['G1', 'db_area_end'] == 8.0
+    assert change_df.loc['G2', 'area_change'] == -1.0
+
+
+def test_save_and_load(store, tmp_path):
+    fp = str(tmp_path / "glims_region_1_temporal.pkl")
+    store.save(fp)
+    assert sorted(os.listdir(tmp_path)) == ["glims_region_1_temporal.pkl", "glims_region_1_temporal_crs.txt",
+                                            "glims_region_1_temporal_wkb.pkl"]
+
+    loaded = TemporalGlimsStore.load(fp)
+    assert loaded.table.equals(store.table)
+    assert gpd.GeoSeries([], crs=loaded.crs).crs == gpd.GeoSeries([], crs=store.crs).crs